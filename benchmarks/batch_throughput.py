@@ -0,0 +1,67 @@
+"""Throughput of encode_many/decode_many against a per-call json_to_toon/toon_to_json loop.
+
+Run with ``uv run python benchmarks/batch_throughput.py [--docs N] [--workers N]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from json2toon import decode_many, encode_many, json_to_toon, toon_to_json
+
+
+def make_documents(count: int) -> list[dict[str, Any]]:
+    """Build small documents like the records of a batch job."""
+    return [
+        {
+            "id": i,
+            "user": {"name": f"user{i}", "active": i % 2 == 0},
+            "tags": ["alpha", "beta", "gamma"][: i % 4],
+            "lines": [{"sku": f"SKU-{j}", "qty": j, "price": j * 1.25} for j in range(i % 5)],
+        }
+        for i in range(count)
+    ]
+
+
+def measure(name: str, run: Callable[[], Iterable[Any]], count: int, repeat: int) -> None:
+    """Print the best documents-per-second rate of ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in run():
+            pass
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<32} {count / best:>12,.0f} docs/s")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=20_000, help="Documents per run")
+    parser.add_argument("--workers", type=int, default=4, help="Pool size")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args()
+
+    docs = make_documents(args.docs)
+    texts = [json_to_toon(doc) for doc in docs]
+    n, w, r = args.docs, args.workers, args.repeat
+
+    measure("json_to_toon loop", lambda: [json_to_toon(doc) for doc in docs], n, r)
+    measure("encode_many", lambda: encode_many(docs), n, r)
+    measure(f"encode_many threads={w}", lambda: encode_many(docs, workers=w), n, r)
+    measure(
+        f"encode_many processes={w}", lambda: encode_many(docs, workers=w, pool="process"), n, r
+    )
+    measure("toon_to_json loop", lambda: [toon_to_json(text) for text in texts], n, r)
+    measure("decode_many", lambda: decode_many(texts), n, r)
+    measure(f"decode_many threads={w}", lambda: decode_many(texts, workers=w), n, r)
+    measure(
+        f"decode_many processes={w}", lambda: decode_many(texts, workers=w, pool="process"), n, r
+    )
+
+
+if __name__ == "__main__":
+    main()
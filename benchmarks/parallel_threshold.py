@@ -0,0 +1,81 @@
+"""Break-even size of parallel array encoding, from its measured cost components.
+
+Parallel encoding saves ``serial * (1 - 1/workers)`` per unit of work but pays
+for pickling the items and their output across processes, plus starting the
+pool once. This prints each component and the array size where they cancel out,
+which is what ``_PARALLEL_MIN_CELLS``/``_PARALLEL_MIN_ITEMS`` are derived from.
+The estimate also holds on hosts with fewer cores than workers, where timing
+``workers=N`` directly would only measure contention.
+
+Run with ``uv run python benchmarks/parallel_threshold.py [--size N] [--workers N]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import pickle
+import time
+from collections.abc import Callable
+from typing import Any
+
+from json2toon import ToonConfig, json_to_toon
+from json2toon.encoder import _init_worker, _process_pool
+
+
+def best(run: Callable[[], Any], repeat: int) -> float:
+    """Return the fastest of ``repeat`` runs, in seconds."""
+    result = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        result = min(result, time.perf_counter() - start)
+    return result
+
+
+def per_unit(data: list[Any], units: int, repeat: int) -> tuple[float, float]:
+    """Return the serial encoding and the pickling cost of ``data`` per unit of work."""
+    text = json_to_toon({"data": data})
+    serial = best(lambda: json_to_toon({"data": data}), repeat)
+    transfer = best(
+        lambda: (pickle.loads(pickle.dumps(data, 5)), pickle.loads(pickle.dumps(text, 5))), repeat
+    )
+    return serial / units, transfer / units
+
+
+def start_pool(workers: int) -> None:
+    """Start a pool of encoding workers and run one task in each."""
+    with _process_pool(workers, _init_worker, (ToonConfig(),)) as pool:
+        list(pool.map(abs, range(workers)))
+
+
+def report(name: str, unit: str, serial: float, transfer: float, startup: float, w: int) -> None:
+    """Print the cost components and the break-even size for ``w`` workers."""
+    saving = serial * (1 - 1 / w) - transfer
+    crossover = f"{startup / saving:>12,.0f} {unit}" if saving > 0 else "never"
+    print(
+        f"{name:<10} serial {serial * 1e9:>7,.0f} ns/{unit:<5} "
+        f"transfer {transfer * 1e9:>7,.0f} ns/{unit:<5} break-even at {crossover}"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=20_000, help="Items per array")
+    parser.add_argument("--fields", type=int, default=8, help="Fields per tabular row")
+    parser.add_argument("--workers", type=int, default=4, help="Pool size")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    args = parser.parse_args()
+
+    n, f, w, r = args.size, args.fields, args.workers, args.repeat
+    rows = [{f"f{j}": i * j if j % 3 else f"s{i}-{j}" for j in range(f)} for i in range(n)]
+    items = [[i, [i, "x"]] for i in range(n)]
+
+    startup = best(lambda: start_pool(w), r)
+    print(f"pool start {startup * 1e3:,.0f} ms for {w} workers")
+    report("tabular", "cell", *per_unit(rows, n * f, r), startup, w)
+    report("nested", "item", *per_unit(items, n, r), startup, w)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,25 @@ This package provides functions and classes for converting between JSON and TOON
 
 from __future__ import annotations
 
-from json2toon.decoder import ToonDecoder, ToonParseConfig, ToonParseError, toon_to_json
-from json2toon.encoder import ToonConfig, ToonEncoder, json_to_toon
+from json2toon.batch import decode_many, encode_many
+from json2toon.decoder import (
+    IncrementalToonDecoder,
+    LazyArray,
+    LazyObject,
+    ToonDecoder,
+    ToonParseConfig,
+    ToonParseError,
+    iter_rows,
+    toon_to_json,
+)
+from json2toon.encoder import (
+    CompiledEncoder,
+    TabularColumns,
+    ToonConfig,
+    ToonEncoder,
+    json_to_toon,
+    json_to_toon_stream,
+)
 
 __version__ = "0.1.2"
 
@@ -15,12 +32,22 @@ __all__ = [
     # Encoder
     "ToonEncoder",
     "ToonConfig",
+    "TabularColumns",
+    "CompiledEncoder",
     "json_to_toon",
+    "json_to_toon_stream",
     # Decoder
     "ToonDecoder",
+    "IncrementalToonDecoder",
+    "LazyObject",
+    "LazyArray",
     "ToonParseConfig",
     "ToonParseError",
     "toon_to_json",
+    "iter_rows",
+    # Batch
+    "encode_many",
+    "decode_many",
     # Version
     "__version__",
 ]
@@ -0,0 +1,165 @@
+"""Batch conversion of many documents through one shared encoder or decoder."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
+from typing import Any
+
+from json2toon.decoder import _DEFAULT_CONFIG as _DEFAULT_PARSE_CONFIG
+from json2toon.decoder import ToonDecoder, ToonParseConfig, _shared_decoder
+from json2toon.encoder import _DEFAULT_CONFIG, ToonConfig, _process_pool, _shared_encoder
+
+__all__ = ["decode_many", "encode_many"]
+
+_POOLS = ("thread", "process")
+
+# Documents handed to a worker at once, so small documents do not each pay
+# for a task round trip
+_CHUNK_SIZE = 64
+
+# Chunks in flight per worker; bounds memory use when results are consumed slowly
+_CHUNKS_PER_WORKER = 4
+
+
+def encode_many(
+    documents: Iterable[Any],
+    config: ToonConfig | None = None,
+    workers: int | None = None,
+    pool: str = "thread",  # "thread" or "process"
+    ordered: bool = True,
+) -> Iterator[str]:
+    """Encode many documents, reusing one encoder and its caches for all of them.
+
+    Documents are read from ``documents`` lazily and results are produced as
+    an iterator, so only a bounded number of documents is held at a time.
+
+    Args:
+        documents: Iterable of Python objects to encode
+        config: Optional encoding configuration
+        workers: Optional number of threads or processes to encode in
+        pool: Kind of worker pool used when ``workers`` is above 1
+        ordered: Whether results follow input order; if false they are
+            produced as soon as they are ready
+
+    Returns:
+        Iterator of TOON format strings
+    """
+    config = config or _DEFAULT_CONFIG
+    if workers is None or workers == 1:
+        _check_pool(workers, pool)
+        return map(_shared_encoder(config).encode, documents)
+    return _map_many(_encode_chunk, config, documents, workers, pool, ordered)
+
+
+def decode_many(
+    documents: Iterable[str],
+    config: ToonParseConfig | None = None,
+    workers: int | None = None,
+    pool: str = "thread",  # "thread" or "process"
+    ordered: bool = True,
+) -> Iterator[Any]:
+    """Decode many TOON strings, reusing one decoder for all of them.
+
+    Args:
+        documents: Iterable of TOON format strings
+        config: Optional parsing configuration
+        workers: Optional number of threads or processes to decode in
+        pool: Kind of worker pool used when ``workers`` is above 1
+        ordered: Whether results follow input order; if false they are
+            produced as soon as they are ready
+
+    Returns:
+        Iterator of decoded Python objects
+    """
+    config = config or _DEFAULT_PARSE_CONFIG
+    if workers is None or workers == 1:
+        _check_pool(workers, pool)
+        # A decoder of its own, since the iterator may be consumed on any thread
+        return map(ToonDecoder(config).decode, documents)
+    return _map_many(_decode_chunk, config, documents, workers, pool, ordered)
+
+
+def _check_pool(workers: int | None, pool: str) -> None:
+    """Validate the worker count and pool kind of a batch call."""
+    if workers is not None and workers < 1:
+        msg = f"Invalid workers: {workers}"
+        raise ValueError(msg)
+    if pool not in _POOLS:
+        msg = f"Invalid pool: {pool!r}"
+        raise ValueError(msg)
+
+
+def _encode_chunk(config: ToonConfig, documents: list[Any]) -> list[str]:
+    """Encode a chunk of documents with the shared encoder of a config."""
+    encode = _shared_encoder(config).encode
+    return [encode(document) for document in documents]
+
+
+def _decode_chunk(config: ToonParseConfig, documents: list[str]) -> list[Any]:
+    """Decode a chunk of documents with this thread's decoder for a config."""
+    decode = _shared_decoder(config).decode
+    return [decode(document) for document in documents]
+
+
+def _map_many[C, R](
+    task: Callable[[C, list[Any]], list[R]],
+    config: C,
+    documents: Iterable[Any],
+    workers: int,
+    pool: str,
+    ordered: bool,
+) -> Iterator[R]:
+    """Run ``task`` over chunks of documents in a worker pool started on first use."""
+    _check_pool(workers, pool)
+    return _pooled(task, config, iter(documents), workers, pool, ordered)
+
+
+def _pooled[C, R](
+    task: Callable[[C, list[Any]], list[R]],
+    config: C,
+    documents: Iterator[Any],
+    workers: int,
+    pool: str,
+    ordered: bool,
+) -> Iterator[R]:
+    """Yield the results of ``task`` over chunks of documents, shutting the pool down after."""
+    if pool == "thread":
+        executor: Executor = ThreadPoolExecutor(workers)
+    else:
+        executor = _process_pool(workers)
+
+    chunks = iter(lambda: list(islice(documents, _CHUNK_SIZE)), [])
+    futures = (executor.submit(task, config, chunk) for chunk in chunks)
+    limit = workers * _CHUNKS_PER_WORKER
+    try:
+        yield from _in_order(futures, limit) if ordered else _as_ready(futures, limit)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _in_order[R](futures: Iterator[Future[list[R]]], limit: int) -> Iterator[R]:
+    """Yield the results of chunk futures in submission order, ``limit`` in flight."""
+    pending = deque(islice(futures, limit))
+    while pending:
+        results = pending.popleft().result()
+        pending.extend(islice(futures, 1))
+        yield from results
+
+
+def _as_ready[R](futures: Iterator[Future[list[R]]], limit: int) -> Iterator[R]:
+    """Yield the results of chunk futures as they complete, ``limit`` in flight."""
+    pending = set(islice(futures, limit))
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        pending.update(islice(futures, len(done)))
+        for future in done:
+            yield from future.result()
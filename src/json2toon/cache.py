@@ -0,0 +1,78 @@
+"""Memory-bounded LRU cache of rendered TOON subtrees."""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, NamedTuple
+
+__all__ = ["SubtreeCache", "SubtreeCacheInfo"]
+
+
+class SubtreeCacheInfo(NamedTuple):
+    """Hit/miss statistics and memory use of a subtree cache."""
+
+    hits: int
+    misses: int
+    entries: int
+    size: int  # Bytes held by the cached text
+    max_size: int
+
+
+class SubtreeCache:
+    """LRU cache of rendered subtree text, evicting entries beyond a byte budget.
+
+    Each entry may keep a reference to the object it was rendered from, so
+    identity-keyed entries can be checked against the object being encoded
+    (and its ``id`` cannot be reused while the entry is alive). The cache is
+    safe to share between threads.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize an empty cache holding at most ``max_size`` bytes of text."""
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[str, Any, int]] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, ref: Any = None) -> str | None:  # noqa: ANN401
+        """Return the text cached under ``key`` for ``ref``, or ``None`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] is not ref:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, text: str, ref: Any = None) -> None:  # noqa: ANN401
+        """Cache ``text`` under ``key``, evicting the least recently used entries."""
+        size = sys.getsizeof(text)
+        if size > self.max_size:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[2]
+            self._entries[key] = (text, ref, size)
+            self._size += size
+            while self._size > self.max_size:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+
+    def clear(self) -> None:
+        """Remove all entries; the counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def info(self) -> SubtreeCacheInfo:
+        """Return hit/miss statistics and memory use."""
+        return SubtreeCacheInfo(
+            self._hits, self._misses, len(self._entries), self._size, self.max_size
+        )
@@ -4,11 +4,41 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
-from json2toon import ToonConfig, ToonParseConfig, json_to_toon, toon_to_json
+from json2toon import ToonConfig, ToonParseConfig, json_to_toon_stream, toon_to_json
+
+
+@contextmanager
+def _replacing(path: Path) -> Iterator[IO[str]]:
+    """Open a temporary file that replaces ``path`` once it is written without error.
+
+    The file is created next to ``path``, so the replacement is atomic and
+    a failed conversion leaves any existing file untouched.
+    """
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w") as f:
+            yield f
+        # Keep the mode of the file being replaced, or the usual one of a new file
+        try:
+            mode = path.stat().st_mode & 0o7777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        tmp_path.chmod(mode)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
 def json2toon_main() -> None:
@@ -21,6 +51,7 @@ Examples:
   json2toon input.json -o output.toon
   cat data.json | json2toon
   json2toon input.json --indent 4 --delimiter tab
+  json2toon large.json -o large.toon --jobs 4
         """,
     )
 
@@ -65,6 +96,15 @@ Examples:
         help="Disable strict mode validation",
     )
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Encode large arrays in N worker processes (default: 1)",
+    )
+
     args = parser.parse_args()
 
     try:
@@ -93,15 +133,14 @@ Examples:
             strict=not args.no_strict,
         )
 
-        # Convert
-        toon_string = json_to_toon(data, config)
-
-        # Write output
+        # Convert and write output
         if args.output:
-            output_path = Path(args.output)
-            output_path.write_text(toon_string + "\n")
+            with _replacing(Path(args.output)) as f:
+                json_to_toon_stream(data, f, config, workers=args.jobs)
+                f.write("\n")
         else:
-            print(toon_string)
+            json_to_toon_stream(data, sys.stdout, config, workers=args.jobs)
+            sys.stdout.write("\n")
 
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON: {e}", file=sys.stderr)
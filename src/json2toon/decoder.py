@@ -3,10 +3,26 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from typing import Any
-
-__all__ = ["ToonDecoder", "ToonParseConfig", "ToonParseError"]
+import sys
+import threading
+from array import array
+from collections.abc import Callable, Generator, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, replace
+from functools import lru_cache, partial
+from io import StringIO
+from typing import Any, NamedTuple, overload
+
+from json2toon.scalars import _MAX_CACHED_LENGTH, unescape_string
+
+__all__ = [
+    "IncrementalToonDecoder",
+    "LazyArray",
+    "LazyObject",
+    "ToonDecoder",
+    "ToonParseConfig",
+    "ToonParseError",
+    "iter_rows",
+]
 
 
 class ToonParseError(Exception):
@@ -15,13 +31,113 @@ class ToonParseError(Exception):
     pass
 
 
-@dataclass
+# Quoted spans and backslash escapes, which hide the colons, delimiters and
+# brackets inside them (an unterminated quote runs to the end of the line)
+_STRING = r'"(?:[^"\\]++|\\[\s\S]?)*+"?+'
+_QUOTED = rf"\\[\s\S]?|{_STRING}"
+
+# The line lexer: an array header (key, length, delimiter marker, fields and
+# inline value), or else a key up to the first unquoted colon and the value
+# after it, skipping quoted spans and backslash escapes (but a backslash does
+# not escape the bracket opening a header). Lines without a bracket skip the
+# header alternative. Each piece of the header key starts with a different
+# character and is atomic, so a failed header is not retried with the key
+# split up another way.
+_KEY_VALUE_LINE = rf'((?:[^:"\\]++|{_QUOTED})*+)(?::([\s\S]*))?'
+_HEADER_KEY = rf'(?>[^:"\\\[]++|\\(?:(?!\[)[\s\S])?+|{_STRING}|\[)*?'
+_LINE = re.compile(
+    rf"({_HEADER_KEY})\[(\d+)([\t|])?\](?:\{{([^}}]+)\}})?:([\s\S]*)"
+    rf"|{_KEY_VALUE_LINE}"
+).match
+_PLAIN_LINE = re.compile(_KEY_VALUE_LINE).match
+
+# Kinds of line tokens
+_HEADER = "header"  # key[N]{fields}: with an optional inline value
+_KEY_VALUE = "key_value"  # key: value, or key: with the value below
+_ITEM = "item"  # - content, or a bare dash
+_TEXT = "text"  # No unquoted colon: a primitive or a tabular row
+
+# Line starts marking a list item: a dash and a space, or a bare dash
+_ITEM_PREFIXES = ("- ", "-")
+
+# Plain decimal floats (integers are recognized with str.isdigit). int() and
+# float() also accept underscores, a plus sign and non-ASCII digits, which take
+# the slow path
+_FLOAT = re.compile(r"-?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?").fullmatch
+
+_LITERALS: dict[str, Any] = {"null": None, "true": True, "false": False}
+
+# Longer numeric tokens may exceed int()'s digit limit and take the slow path
+_MAX_FAST_NUMBER = 640
+
+# Dotted key segments that may be expanded into nested objects
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _cell_pattern(stops: str) -> re.Pattern[str]:
+    """Compile a pattern matching one delimited cell, up to an unquoted stop character.
+
+    Backslashes escape the next character and double quotes toggle quoting
+    (an unterminated quote runs to the end of the line); possessive
+    quantifiers keep the scan linear.
+    """
+    return re.compile(r'(?:\\[\s\S]?|"(?:\\[\s\S]?|[^"\\])*+"?|[^' + re.escape(stops) + r'"\\])*+')
+
+
+# Cells of a row or inline array, and the first cell of a line that may
+# instead be a key: value line (stopping at an unquoted colon), per delimiter
+_CELL = {delimiter: _cell_pattern(delimiter).match for delimiter in (",", "\t", "|")}
+_FIRST_CELL = {delimiter: _cell_pattern(delimiter + ":").match for delimiter in (",", "\t", "|")}
+
+# Ready decoders kept for toon_to_json, per thread and config
+_SHARED_DECODERS = 32
+
+
+class _LineToken(NamedTuple):
+    """A lexed line: its kind and the parts the parser needs."""
+
+    kind: str
+    content: str  # Stripped line, or the content after the dash of a list item
+    key: str | None  # Unquoted key, or None when there is no unquoted colon
+    value: str  # Stripped text after the colon
+    header: tuple[int, str | None, list[str] | None] | None  # (length, delimiter, fields)
+
+
+# A parse event: its name and value, such as ("key", "id") or ("row", (1, "a"))
+_Event = tuple[str, Any]
+
+_START_OBJECT: _Event = ("start_object", None)
+# Starts a list item object with its first field on the dash line, where keys are not
+# expanded; only yielded by event parsers created with ``mark_items``
+_START_ITEM_OBJECT: _Event = ("start_object", _ITEM)
+_END_OBJECT: _Event = ("end_object", None)
+_END_ARRAY: _Event = ("end_array", None)
+_NULL: _Event = ("value", None)
+
+# Keys and list indices leading from the document to a value
+_Path = tuple[str | int, ...]
+
+# Yielded by the event parser when it needs a line that has not been supplied yet
+_NEED_LINE: _Event = ("need_line", None)
+
+# Builds a token from a tuple of its fields without the Python-level __new__
+# NamedTuple generates, which is measurable on the lexer's hot path
+_make_token: Callable[[tuple[Any, ...]], _LineToken] = partial(tuple.__new__, _LineToken)
+
+
+@dataclass(frozen=True, slots=True)
 class ToonParseConfig:
-    """Configuration options for TOON parsing."""
+    """Configuration options for TOON parsing.
+
+    Configs are immutable and hashable, so decoders built from them can be
+    shared and cached.
+    """
 
     expand_paths: str | None = None  # "safe" or None
     strict: bool = True
     indent_size: int = 2
+    token_cache_size: int = 4096  # Cached parses of short primitive tokens (0 disables)
+    lazy: bool = False  # Decode object fields only when they are accessed
 
 
 class ToonDecoder:
@@ -30,47 +146,156 @@ class ToonDecoder:
     def __init__(self, config: ToonParseConfig | None = None) -> None:
         """Initialize the decoder with optional configuration."""
         self.config = config or ToonParseConfig()
-        self.lines: list[str] = []
+        self._validate_config()
+        self._parse_cached: Callable[[str], Any]
+        if self.config.token_cache_size:
+            self._parse_cached = lru_cache(maxsize=self.config.token_cache_size)(
+                self._parse_interned
+            )
+        else:
+            self._parse_cached = self._parse_token
+        self.text = ""
+        # Line index: depth, and offsets of the stripped content in ``text``
+        self.depths = array("i")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.tokens: list[_LineToken | None] = []  # Filled in as lines are lexed
+        self.line_count = 0
+        self.current_line = 0
+
+    def _release(self) -> None:
+        """Drop the document and its line index once it is decoded.
+
+        Decoders are kept for reuse, and would otherwise hold on to the last
+        document they decoded.
+        """
+        self.text = ""
+        self.depths = array("i")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.tokens = []
+        self.line_count = 0
         self.current_line = 0
 
+    def _validate_config(self) -> None:
+        """Validate configuration."""
+        if self.config.token_cache_size < 0:
+            msg = f"Invalid token_cache_size: {self.config.token_cache_size}"
+            raise ValueError(msg)
+
     def decode(self, toon_string: str) -> Any:  # noqa: ANN401
-        """Decode TOON format string to Python object."""
+        """Decode TOON format string to Python object.
+
+        With ``lazy`` set in the config, an object document is returned as a
+        ``LazyObject`` that decodes each field when it is first accessed.
+        """
+        if self.config.lazy:
+            return _decode_lazy(toon_string, self.config)
         if not toon_string.strip():
             return {}  # Empty document is empty object
 
-        self.lines = toon_string.split("\n")
+        self._index_lines(toon_string)
         self.current_line = 0
-
-        # Discover root form
-        root_form = self._discover_root_form()
-
-        if root_form == "array":
-            return self._parse_root_array()
-        if root_form == "primitive":
-            return self._parse_primitive(self.lines[0].strip())
-
-        # Default: object
-        return self._parse_object(0)
+        try:
+            # Discover root form
+            root_form = self._discover_root_form()
+
+            if root_form == "array":
+                return self._parse_root_array()
+            if root_form == "primitive":
+                return self._parse_primitive(self._content(0))
+
+            # Default: object
+            return self._parse_object(0)
+        finally:
+            self._release()
+
+    def iterparse(self, source: str | Iterable[str]) -> Iterator[tuple[str, Any]]:
+        """Parse TOON into a stream of events instead of building the decoded object.
+
+        Lines are read from ``source`` only as the events are consumed, and
+        no more than the current line is kept, so memory use does not grow
+        with the document. Each event is an ``(event, value)`` pair:
+
+        - ``("start_object", None)`` and ``("end_object", None)``
+        - ``("key", key)`` before the value of each object field
+        - ``("start_array", (length, fields))``, where ``length`` is None for
+          list items without a declared length and ``fields`` holds the field
+          names of a tabular array (None otherwise)
+        - ``("row", values)`` for each row of a tabular array, with the typed
+          values in field order
+        - ``("value", value)`` for a primitive
+        - ``("end_array", None)``
+
+        Keys are reported as written; ``expand_paths`` is not applied.
+
+        Args:
+            source: TOON string, text file or other iterable of lines
+
+        Returns:
+            Iterator of ``(event, value)`` pairs
+        """
+        # A string is split like the lines of a file, so a trailing newline
+        # does not add a blank line
+        lines = StringIO(source) if isinstance(source, str) else source
+        return _EventParser(self, iter(lines)).events()
+
+    def _index_lines(self, text: str) -> None:
+        """Lex the document once into line depths and content offsets.
+
+        Each line is stripped and measured exactly once here, and the
+        indentation of every non-blank line is validated up front; the
+        parser only reads the index afterwards. Blank lines keep the depth
+        of their leading spaces.
+        """
+        indent_size = self.config.indent_size
+        strict = self.config.strict
+        depths = array("i")
+        starts = array("q")
+        ends = array("q")
+        pos = 0
+        for line in text.split("\n"):
+            length = len(line)
+            spaces = length - len(line.lstrip(" "))
+            content = line.strip()
+            if content:
+                if strict and spaces % indent_size:
+                    msg = f"Indentation must be multiple of {indent_size}"
+                    raise ToonParseError(msg)
+                start = pos + length - len(line.lstrip())
+                end = start + len(content)
+            else:
+                start = end = pos
+            depths.append(spaces // indent_size)
+            starts.append(start)
+            ends.append(end)
+            pos += length + 1
+
+        self.text = text
+        self.depths = depths
+        self.starts = starts
+        self.ends = ends
+        self.line_count = len(depths)
+        self.tokens = [None] * self.line_count
+
+    def _content(self, index: int) -> str:
+        """Return the stripped content of a line."""
+        return self.text[self.starts[index] : self.ends[index]]
 
     def _discover_root_form(self) -> str:
         """Discover the root form (object, array, or primitive)."""
         # Find first non-empty depth-0 line
-        for line in self.lines:
-            stripped = line.strip()
-            if not stripped:
-                continue
-
-            # Check indentation
-            depth = self._get_depth(line)
-            if depth > 0:
+        for index in range(self.line_count):
+            if self.starts[index] == self.ends[index] or self.depths[index] > 0:
                 continue
+            token = self._lex(index)
 
             # Check if it's a ROOT array header (starts with bracket, no key)
-            if stripped.startswith("[") and self._is_array_header(stripped):
+            if token.kind == _HEADER and token.content.startswith("["):
                 return "array"
 
             # Check if it's a single primitive (no key-value structure)
-            if ":" not in stripped or not self._has_unquoted_colon(stripped):
+            if token.key is None:
                 return "primitive"
 
             # It's an object
@@ -84,12 +309,12 @@ class ToonDecoder:
         if first_line is None:
             return []
 
-        header_match = self._parse_array_header(first_line)
-        if not header_match:
+        token = self._lex(self.current_line)
+        if token.header is None:
             msg = f"Expected array header, got: {first_line}"
             raise ToonParseError(msg)
 
-        length, delimiter, fields = header_match
+        length, delimiter, fields = token.header
 
         if fields:
             # Tabular array
@@ -102,16 +327,18 @@ class ToonDecoder:
     def _parse_object(self, depth: int) -> dict[str, Any]:
         """Parse an object at given depth."""
         obj: dict[str, Any] = {}
+        depths, starts, ends = self.depths, self.starts, self.ends
+        expand_paths = self.config.expand_paths == "safe"
 
-        while self.current_line < len(self.lines):
-            line = self.lines[self.current_line]
+        while self.current_line < self.line_count:
+            index = self.current_line
 
             # Skip empty lines outside arrays
-            if not line.strip():
+            if starts[index] == ends[index]:
                 self.current_line += 1
                 continue
 
-            line_depth = self._get_depth(line)
+            line_depth = depths[index]
 
             # If less indented, we're done with this object
             if line_depth < depth:
@@ -122,15 +349,13 @@ class ToonDecoder:
                 self.current_line += 1
                 continue
 
-            # Parse this line
-            stripped = line.strip()
-
             # Check for key-value or key-with-nested
-            if ":" in stripped:
-                key, value = self._parse_key_value(stripped, depth)
+            token = self._entry(index)
+            if token is not None:
+                key, value = self._parse_key_value(token, depth)
 
                 # Handle path expansion
-                if self.config.expand_paths == "safe" and "." in key:
+                if expand_paths and "." in key:
                     self._expand_path_into_object(obj, key, value)
                 else:
                     obj[key] = value
@@ -141,55 +366,39 @@ class ToonDecoder:
 
         return obj
 
-    def _parse_key_value(self, line: str, depth: int) -> tuple[str, Any]:
+    def _parse_key_value(self, token: _LineToken, depth: int) -> tuple[str, Any]:
         """Parse a key-value line."""
-        # Find the first unquoted colon
-        colon_pos = self._find_unquoted_colon(line)
-        if colon_pos == -1:
-            msg = f"Expected colon in line: {line}"
-            raise ToonParseError(msg)
-
-        key_part = line[:colon_pos].strip()
-        value_part = line[colon_pos + 1 :].strip()
-
-        # Parse key (may be quoted)
-        key = self._parse_key(key_part)
+        assert token.key is not None
+        key = token.key
+        value_part = token.value
 
         # Check if it's an array
         value: Any
-        if "[" in key_part and "]" in key_part:
-            # Array value
-            array_match = self._parse_array_header(line)
-            if array_match:
-                # Extract key before bracket
-                bracket_pos = key_part.index("[")
-                key = key_part[:bracket_pos].strip()
-
-                length, delimiter, fields = array_match
-                self.current_line += 1
+        if token.header is not None:
+            length, delimiter, fields = token.header
+            self.current_line += 1
 
-                if fields:
-                    # Tabular array
-                    value = self._parse_tabular_array(depth + 1, length, delimiter or ",", fields)
-                elif not value_part:
-                    # Items below
-                    value = self._parse_array_items(depth + 1, length, delimiter or ",")
-                else:
-                    # Inline primitive array
-                    value = self._parse_inline_array(value_part, delimiter or ",", length)
-                return key, value
+            if fields:
+                # Tabular array
+                value = self._parse_tabular_array(depth + 1, length, delimiter or ",", fields)
+            elif not value_part:
+                # Items below
+                value = self._parse_array_items(depth + 1, length, delimiter or ",")
+            else:
+                # Inline primitive array
+                value = self._parse_inline_array(value_part, delimiter or ",", length)
+            return key, value
 
         # Check if value is empty (nested object/array below)
         if not value_part:
             self.current_line += 1
             # Peek next line to determine type
-            if self.current_line < len(self.lines):
-                next_line = self.lines[self.current_line]
-                next_depth = self._get_depth(next_line)
+            if self.current_line < self.line_count:
+                next_depth = self.depths[self.current_line]
 
                 if next_depth > depth:
                     # Nested content
-                    if next_line.strip().startswith("-"):
+                    if self._starts_with_dash(self.current_line):
                         # Array items
                         value = self._parse_list_items(depth + 1)
                     else:
@@ -209,18 +418,19 @@ class ToonDecoder:
     def _parse_array_items(self, depth: int, expected_length: int, delimiter: str) -> list[Any]:
         """Parse array items (list format with dashes)."""
         items: list[Any] = []
+        depths, starts, ends = self.depths, self.starts, self.ends
 
-        while self.current_line < len(self.lines):
-            line = self.lines[self.current_line]
+        while self.current_line < self.line_count:
+            index = self.current_line
 
-            if not line.strip():
+            if starts[index] == ends[index]:
                 if self.config.strict:
                     msg = "Blank lines not allowed inside arrays in strict mode"
                     raise ToonParseError(msg)
                 self.current_line += 1
                 continue
 
-            line_depth = self._get_depth(line)
+            line_depth = depths[index]
             if line_depth < depth:
                 break
 
@@ -228,72 +438,65 @@ class ToonDecoder:
                 self.current_line += 1
                 continue
 
-            stripped = line.strip()
+            token = self._lex(index)
+            if token.kind != _ITEM:
+                # Something else, break
+                break
 
-            if stripped.startswith("- "):
-                # List item with content on same line
-                content = stripped[2:].strip()
+            if token.key is not None:
+                # List item starting an object: its first field is on the dash line
+                obj: dict[str, Any] = {}
+                key = token.key
 
-                if ":" in content:
-                    # Object or nested
-                    colon_pos = self._find_unquoted_colon(content)
-                    key_part = content[:colon_pos].strip()
-                    value_part = content[colon_pos + 1 :].strip()
+                if not token.value:
+                    # Nested value below
+                    self.current_line += 1
+                    if self.current_line < self.line_count:
+                        next_depth = depths[self.current_line]
+                        if next_depth > depth:
+                            obj[key] = self._parse_value_at_depth(depth + 1)
+                        else:
+                            obj[key] = None
+                else:
+                    obj[key] = self._parse_primitive(token.value)
+                    self.current_line += 1
 
-                    # Start building object
-                    obj: dict[str, Any] = {}
-                    key = self._parse_key(key_part)
+                # Check for more fields
+                while self.current_line < self.line_count:
+                    index2 = self.current_line
+                    line2_depth = depths[index2]
 
-                    if not value_part:
-                        # Nested value below
+                    if line2_depth < depth + 1:
+                        break
+                    if line2_depth > depth + 1:
                         self.current_line += 1
-                        if self.current_line < len(self.lines):
-                            next_depth = self._get_depth(self.lines[self.current_line])
-                            if next_depth > depth:
-                                obj[key] = self._parse_value_at_depth(depth + 1)
-                            else:
-                                obj[key] = None
+                        continue
+
+                    if self._starts_with_dash(index2):
+                        break
+
+                    # Additional field
+                    token2 = self._entry(index2)
+                    if token2 is not None:
+                        k2, v2 = self._parse_key_value(token2, depth + 1)
+                        obj[k2] = v2
                     else:
-                        obj[key] = self._parse_primitive(value_part)
                         self.current_line += 1
 
-                    # Check for more fields
-                    while self.current_line < len(self.lines):
-                        line2 = self.lines[self.current_line]
-                        line2_depth = self._get_depth(line2)
-
-                        if line2_depth < depth + 1:
-                            break
-                        if line2_depth > depth + 1:
-                            self.current_line += 1
-                            continue
-
-                        stripped2 = line2.strip()
-                        if stripped2.startswith("-"):
-                            break
-
-                        # Additional field
-                        if ":" in stripped2:
-                            k2, v2 = self._parse_key_value(stripped2, depth + 1)
-                            obj[k2] = v2
-                        else:
-                            self.current_line += 1
-
-                    items.append(obj)
-                else:
-                    # Primitive item
-                    items.append(self._parse_primitive(content))
-                    self.current_line += 1
-            elif stripped == "-":
+                items.append(obj)
+            elif token.content:
+                # Primitive item
+                items.append(self._parse_primitive(token.content))
+                self.current_line += 1
+            else:
                 # Empty object or standalone dash
                 self.current_line += 1
 
                 # Check if there are nested fields
-                if self.current_line < len(self.lines):
-                    next_line = self.lines[self.current_line]
-                    next_depth = self._get_depth(next_line)
+                if self.current_line < self.line_count:
+                    next_depth = depths[self.current_line]
 
-                    if next_depth > depth and not next_line.strip().startswith("-"):
+                    if next_depth > depth and not self._starts_with_dash(self.current_line):
                         # It's an object with nested fields
                         obj = self._parse_object(depth + 1)
                         items.append(obj)
@@ -302,9 +505,6 @@ class ToonDecoder:
                         items.append({})
                 else:
                     items.append({})
-            else:
-                # Something else, break
-                break
 
         # Validate count
         if self.config.strict and len(items) != expected_length:
@@ -316,15 +516,16 @@ class ToonDecoder:
     def _parse_list_items(self, depth: int) -> list[Any]:
         """Parse list items without known length."""
         items: list[Any] = []
+        depths, starts, ends = self.depths, self.starts, self.ends
 
-        while self.current_line < len(self.lines):
-            line = self.lines[self.current_line]
+        while self.current_line < self.line_count:
+            index = self.current_line
 
-            if not line.strip():
+            if starts[index] == ends[index]:
                 self.current_line += 1
                 continue
 
-            line_depth = self._get_depth(line)
+            line_depth = depths[index]
             if line_depth < depth:
                 break
 
@@ -332,31 +533,22 @@ class ToonDecoder:
                 self.current_line += 1
                 continue
 
-            stripped = line.strip()
-
-            if stripped.startswith("- ") or stripped == "-":
-                # Parse item similar to above
-                if stripped == "-":
-                    self.current_line += 1
-                    items.append({})
-                else:
-                    content = stripped[2:].strip()
-                    items.append(self._parse_primitive(content))
-                    self.current_line += 1
-            else:
+            token = self._lex(index)
+            if token.kind != _ITEM:
                 break
 
+            # A bare dash is an empty object; anything else a primitive
+            items.append(self._parse_primitive(token.content) if token.content else {})
+            self.current_line += 1
+
         return items
 
     def _parse_value_at_depth(self, depth: int) -> Any:  # noqa: ANN401
         """Parse a value starting at given depth."""
-        if self.current_line >= len(self.lines):
+        if self.current_line >= self.line_count:
             return None
 
-        line = self.lines[self.current_line]
-        stripped = line.strip()
-
-        if stripped.startswith("-"):
+        if self._starts_with_dash(self.current_line):
             return self._parse_list_items(depth)
 
         return self._parse_object(depth)
@@ -366,18 +558,19 @@ class ToonDecoder:
     ) -> list[dict[str, Any]]:
         """Parse tabular array format."""
         rows: list[dict[str, Any]] = []
+        depths, starts, ends = self.depths, self.starts, self.ends
 
-        while self.current_line < len(self.lines):
-            line = self.lines[self.current_line]
+        while self.current_line < self.line_count:
+            index = self.current_line
 
-            if not line.strip():
+            if starts[index] == ends[index]:
                 if self.config.strict:
                     msg = "Blank lines not allowed inside tabular arrays in strict mode"
                     raise ToonParseError(msg)
                 self.current_line += 1
                 continue
 
-            line_depth = self._get_depth(line)
+            line_depth = depths[index]
             if line_depth < depth:
                 break
 
@@ -385,13 +578,11 @@ class ToonDecoder:
                 self.current_line += 1
                 continue
 
-            stripped = line.strip()
-
-            # Check if it's a row (has delimiter before any colon)
-            if self._is_tabular_row(stripped, delimiter):
-                # Parse row
-                values = self._split_by_delimiter(stripped, delimiter)
+            stripped = self.text[starts[index] : ends[index]]
 
+            # A row has a delimiter before any colon (or no colon at all)
+            values = self._split_row(stripped, delimiter)
+            if values is not None:
                 if self.config.strict and len(values) != len(fields):
                     msg = f"Row width mismatch: expected {len(fields)}, got {len(values)}"
                     raise ToonParseError(msg)
@@ -423,171 +614,194 @@ class ToonDecoder:
 
         return [self._parse_primitive(v) for v in values]
 
-    def _parse_array_header(self, line: str) -> tuple[int, str | None, list[str] | None] | None:
-        """Parse array header and return (length, delimiter, fields)."""
-        # Pattern: [N] or [N<delim>] or [N]{fields} or [N<delim>]{fields}
-        match = re.search(r"\[(\d+)([\t|])?\](?:\{([^}]+)\})?:", line)
-        if not match:
-            return None
-
-        length = int(match.group(1))
-        delimiter = match.group(2)  # Can be \t or | or None
-        fields_str = match.group(3)
-
-        fields = None
-        if fields_str:
-            # Parse fields (using the delimiter if specified, else comma)
-            field_delim = delimiter if delimiter else ","
-            fields = [f.strip() for f in fields_str.split(field_delim)]
-
-        return length, delimiter, fields
-
     def _parse_primitive(self, value: str) -> Any:  # noqa: ANN401
         """Parse and type a primitive value."""
         value = value.strip()
+        if len(value) <= _MAX_CACHED_LENGTH:
+            return self._parse_cached(value)
+        return self._parse_token(value)
+
+    def _parse_interned(self, value: str) -> Any:  # noqa: ANN401
+        """Parse a token for the token cache, interning string results."""
+        result = self._parse_token(value)
+        return sys.intern(result) if type(result) is str else result
+
+    def _parse_token(self, value: str) -> Any:  # noqa: ANN401
+        """Type a stripped primitive token, dispatching on its first character."""
+        if not value:
+            return value
+        first = value[0]
 
         # Handle quoted strings
-        if value.startswith('"') and value.endswith('"'):
-            return self._unescape_string(value[1:-1])
+        if first == '"':
+            if value.endswith('"'):
+                return unescape_string(value[1:-1])
+            return value
 
         # Handle literals
-        if value == "null":
-            return None
-        if value == "true":
-            return True
-        if value == "false":
-            return False
+        if first in "ntf":
+            return _LITERALS.get(value, value)
+
+        # Plain numbers
+        if first in "-.0123456789" and len(value) <= _MAX_FAST_NUMBER:
+            digits = value[1:] if first == "-" else value
+            if digits.isdigit() and digits.isascii():
+                return int(value)
+            if _FLOAT(value):
+                return float(value)
+
+        # Other spellings int() and float() accept
+        if "_" in value or "+" in value or not value.isascii() or len(value) > _MAX_FAST_NUMBER:
+            return self._parse_number(value)
+
+        # It's a string
+        return value
 
-        # Try to parse as number
+    def _parse_number(self, value: str) -> Any:  # noqa: ANN401
+        """Parse a token as int() or float() would, or keep it as a string."""
         try:
             if "." in value or "e" in value.lower():
                 return float(value)
             return int(value)
         except ValueError:
-            # It's a string
             return value
 
-    def _unescape_string(self, s: str) -> str:
-        """Unescape a quoted string."""
-        s = s.replace("\\n", "\n")
-        s = s.replace("\\r", "\r")
-        s = s.replace("\\t", "\t")
-        s = s.replace('\\"', '"')
-        s = s.replace("\\\\", "\\")
-        return s
-
     def _parse_key(self, key_str: str) -> str:
         """Parse a key (may be quoted)."""
         key_str = key_str.strip()
         if key_str.startswith('"') and key_str.endswith('"'):
-            return self._unescape_string(key_str[1:-1])
+            return unescape_string(key_str[1:-1])
         return key_str
 
     def _split_by_delimiter(self, line: str, delimiter: str) -> list[str]:
         """Split line by delimiter, respecting quoted strings."""
-        values: list[str] = []
-        current = ""
-        in_quotes = False
-        escaped = False
-
-        for char in line:
-            if escaped:
-                current += char
-                escaped = False
-            elif char == "\\":
-                current += char
-                escaped = True
-            elif char == '"':
-                current += char
-                in_quotes = not in_quotes
-            elif char == delimiter and not in_quotes:
-                values.append(current.strip())
-                current = ""
-            else:
-                current += char
-
-        if current:
-            values.append(current.strip())
-
-        return values
-
-    def _is_tabular_row(self, line: str, delimiter: str) -> bool:
-        """Check if line is a tabular row (has delimiter before colon)."""
-        # Find first unquoted delimiter and first unquoted colon
-        delim_pos = self._find_unquoted_char(line, delimiter)
-        colon_pos = self._find_unquoted_colon(line)
-
-        # No colon means it's a row
-        if colon_pos == -1:
-            return True
-
-        # No delimiter means it's not a row
-        if delim_pos == -1:
-            return False
-
-        # Delimiter before colon means it's a row
-        return delim_pos < colon_pos
-
-    def _find_unquoted_colon(self, line: str) -> int:
-        """Find position of first unquoted colon."""
-        return self._find_unquoted_char(line, ":")
-
-    def _find_unquoted_char(self, line: str, char: str) -> int:
-        """Find position of first unquoted character."""
-        in_quotes = False
-        escaped = False
-
-        for i, c in enumerate(line):
-            if escaped:
-                escaped = False
-                continue
-
-            if c == "\\":
-                escaped = True
-                continue
-
-            if c == '"':
-                in_quotes = not in_quotes
-                continue
-
-            if c == char and not in_quotes:
-                return i
-
-        return -1
-
-    def _has_unquoted_colon(self, line: str) -> bool:
-        """Check if line has an unquoted colon."""
-        return self._find_unquoted_colon(line) != -1
-
-    def _is_array_header(self, line: str) -> bool:
-        """Check if line is an array header."""
-        return bool(re.search(r"\[\d+[\t|]?\](?:\{[^}]+\})?:", line))
-
-    def _get_depth(self, line: str) -> int:
-        """Get indentation depth of a line."""
-        if not line or line[0] not in (" ", "\t"):
-            return 0
-
-        spaces = len(line) - len(line.lstrip(" "))
-
-        # Strict mode: check for tabs
-        if self.config.strict and "\t" in line[:spaces]:
-            msg = "Tabs not allowed in indentation in strict mode"
-            raise ToonParseError(msg)
-
-        # Strict mode: check spaces are multiple of indent_size
-        if self.config.strict and spaces % self.config.indent_size != 0:
-            msg = f"Indentation must be multiple of {self.config.indent_size}"
-            raise ToonParseError(msg)
+        if '"' not in line and "\\" not in line:
+            cells = line.split(delimiter)
+            if not cells[-1]:
+                cells.pop()  # A trailing delimiter does not start another cell
+            return list(map(str.strip, cells))
+        return self._scan_cells(line, delimiter, 0, [])
+
+    def _split_row(self, line: str, delimiter: str) -> list[str] | None:
+        """Split a tabular row into cells, or return None if the line is not a row.
+
+        A line is a row when it has no unquoted colon, or an unquoted
+        delimiter before the first one; the check and the split share a scan.
+        """
+        if '"' not in line and "\\" not in line:
+            colon = line.find(":")
+            if colon != -1 and line.find(delimiter, 0, colon) == -1:
+                return None
+            cells = line.split(delimiter)
+            if not cells[-1]:
+                cells.pop()
+            return list(map(str.strip, cells))
+
+        match = _FIRST_CELL[delimiter](line)
+        assert match is not None  # Cell patterns match the empty string
+        end = match.end()
+        if end == len(line):
+            return [line.strip()]
+        if line[end] == ":":
+            return None
+        return self._scan_cells(line, delimiter, end + 1, [line[:end].strip()])
+
+    def _scan_cells(self, line: str, delimiter: str, pos: int, cells: list[str]) -> list[str]:
+        """Append the cells of ``line`` from ``pos`` on, scanning quoted cells with a regex."""
+        match_cell = _CELL[delimiter]
+        length = len(line)
+        while True:
+            match = match_cell(line, pos)
+            assert match is not None
+            end = match.end()
+            if end == length:
+                if end > pos:
+                    cells.append(line[pos:end].strip())
+                return cells
+            cells.append(line[pos:end].strip())
+            pos = end + 1
+
+    def _lex(self, index: int) -> _LineToken:
+        """Return the token of a non-blank line, lexing it on first use."""
+        token = self.tokens[index]
+        if token is None:
+            content = self.text[self.starts[index] : self.ends[index]]
+            token = self.tokens[index] = self._lex_text(content, items=True)
+        return token
+
+    def _lex_text(self, text: str, items: bool) -> _LineToken:
+        """Classify stripped line content in one scan of the line lexer.
+
+        With ``items``, a leading ``- `` (or a bare ``-``) makes the line a list
+        item, and the rest of it is lexed as the item's content.
+        """
+        item = items and text[:2] in _ITEM_PREFIXES
+        content = text[2:].strip() if item else text
+        kind = _ITEM if item else _KEY_VALUE
+        value_part: str | None
+        if "[" in content:
+            match = _LINE(content)
+            assert match is not None  # The key alternative matches the empty string
+            name, length, delimiter, fields_str, inline, key_part, value_part = match.groups()
+            if length is not None:
+                if item:
+                    # The first field of a list item object keys on everything before the colon
+                    key = self._parse_key(content[: match.start(5) - 1])
+                    return _make_token((_ITEM, content, key, inline.strip(), None))
+                fields = None
+                if fields_str:
+                    # Parse fields (using the delimiter if specified, else comma)
+                    fields = [f.strip() for f in fields_str.split(delimiter or ",")]
+                header = (int(length), delimiter, fields)
+                return _make_token(
+                    (_HEADER, content, self._parse_key(name), inline.strip(), header)
+                )
+        elif '"' in content or "\\" in content:
+            plain = _PLAIN_LINE(content)
+            assert plain is not None
+            key_part, value_part = plain.groups()
+        else:
+            # Nothing is quoted or escaped, so the first colon ends the key
+            key_part, colon, value_part = content.partition(":")
+            if colon:
+                return _make_token((kind, content, key_part.strip(), value_part.strip(), None))
+            value_part = None
+
+        if value_part is None:
+            return _make_token((_ITEM if item else _TEXT, content, None, "", None))
+        return _make_token((kind, content, self._parse_key(key_part), value_part.strip(), None))
+
+    def _entry(self, index: int) -> _LineToken | None:
+        """Return the token of a line inside an object, or None if it has no colon."""
+        token = self.tokens[index]
+        if token is None:
+            content = self.text[self.starts[index] : self.ends[index]]
+            token = self.tokens[index] = self._lex_text(content, items=True)
+        if token.key is not None and token.kind != _ITEM:
+            return token
+        return self._field(self._content(index), token)
+
+    def _field(self, content: str, token: _LineToken) -> _LineToken | None:
+        """Read the token of a line as an object field, or return None if it has no colon."""
+        if token.kind == _ITEM:
+            # A dash line where an object field belongs is read as a key
+            token = self._lex_text(content, items=False)
+        if token.key is None:
+            if ":" in token.content:
+                msg = f"Expected colon in line: {token.content}"
+                raise ToonParseError(msg)
+            return None
+        return token
 
-        return spaces // self.config.indent_size
+    def _starts_with_dash(self, index: int) -> bool:
+        """Check if the content of a line starts with a dash."""
+        return self.text.startswith("-", self.starts[index], self.ends[index])
 
     def _get_next_nonempty_line(self) -> str | None:
         """Get next non-empty line."""
-        while self.current_line < len(self.lines):
-            line = self.lines[self.current_line]
-            if line.strip():
-                return line.strip()
+        while self.current_line < self.line_count:
+            if self.starts[self.current_line] != self.ends[self.current_line]:
+                return self._content(self.current_line)
             self.current_line += 1
         return None
 
@@ -601,7 +815,7 @@ class ToonDecoder:
         parts = path.split(".")
 
         # Check all parts are valid identifiers
-        if not all(re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", p) for p in parts):
+        if not all(_IDENTIFIER.match(p) for p in parts):
             obj[path] = value
             return
 
@@ -622,6 +836,708 @@ class ToonDecoder:
         current[parts[-1]] = value
 
 
+class _EventParser:
+    """Turn TOON lines into parse events, holding only the line being parsed.
+
+    The event methods follow the ``ToonDecoder._parse_*`` methods step for
+    step, but read lines one at a time from an iterator instead of indexing
+    the whole document. When the iterator runs dry before ``closed`` is set,
+    they yield ``_NEED_LINE`` and carry on once more lines are supplied.
+    """
+
+    def __init__(
+        self,
+        decoder: ToonDecoder,
+        lines: Iterator[str],
+        closed: bool = True,
+        mark_items: bool = False,
+    ) -> None:
+        """Initialize the parser over an iterator of lines."""
+        self.decoder = decoder
+        self.start_item = _START_ITEM_OBJECT if mark_items else _START_OBJECT
+        self.strict = decoder.config.strict
+        self.indent_size = decoder.config.indent_size
+        self.lines = lines
+        self.closed = closed  # False while more lines may still be supplied
+        # The current line: whether it has been read, its stripped content and depth
+        self.loaded = False
+        self.content = ""
+        self.depth = 0
+        self.token: _LineToken | None = None
+
+    def _more(self) -> Generator[_Event, None, bool]:
+        """Read the next line unless it is already loaded; False at the end of input."""
+        while not self.loaded:
+            line = next(self.lines, None)
+            if line is not None:
+                self._load(line)
+            elif self.closed:
+                return False
+            else:
+                yield _NEED_LINE
+        return True
+
+    def _load(self, line: str) -> None:
+        """Make a line the current one, validating its indentation."""
+        spaces = len(line) - len(line.lstrip(" "))
+        content = line.strip()
+        if content and self.strict and spaces % self.indent_size:
+            msg = f"Indentation must be multiple of {self.indent_size}"
+            raise ToonParseError(msg)
+        self.content = content
+        self.depth = spaces // self.indent_size
+        self.token = None
+        self.loaded = True
+
+    def _lex(self) -> _LineToken:
+        """Return the token of the current line, lexing it on first use."""
+        if self.token is None:
+            self.token = self.decoder._lex_text(self.content, items=True)
+        return self.token
+
+    def _entry(self) -> _LineToken | None:
+        """Return the token of the current line as an object field, or None if it has no colon."""
+        return self.decoder._field(self.content, self._lex())
+
+    def events(self) -> Iterator[_Event]:
+        """Yield the events of the whole document."""
+        # The root form is decided by the first non-blank line at depth 0
+        first_line: str | None = None
+        skipped: str | None = None  # The first indented line before it
+        while (yield from self._more()):
+            if first_line is None:
+                first_line = self.content
+            if self.content:
+                if self.depth == 0:
+                    break
+                if skipped is None:
+                    skipped = self.content
+            self.loaded = False
+        else:
+            # Empty or all indented
+            yield _START_OBJECT
+            yield _END_OBJECT
+            return
+
+        token = self._lex()
+        if token.kind == _HEADER and token.content.startswith("["):
+            assert token.header is not None
+            if skipped is not None:
+                msg = f"Expected array header, got: {skipped}"
+                raise ToonParseError(msg)
+            length, delimiter, fields = token.header
+            if fields:
+                yield from self._tabular_array(0, length, delimiter or ",", fields)
+            else:
+                self.loaded = False
+                yield from self._array_items(0, length, delimiter or ",")
+        elif token.key is None:
+            assert first_line is not None
+            yield "value", self.decoder._parse_primitive(first_line)
+        else:
+            yield from self._object(0)
+            return
+
+        # Lines after a root array or primitive are ignored, but still validated
+        while self.loaded or (yield from self._more()):
+            self.loaded = False
+
+    def _object(self, depth: int) -> Iterator[_Event]:
+        """Yield the events of an object at given depth."""
+        yield _START_OBJECT
+        while self.loaded or (yield from self._more()):
+            if not self.content or self.depth > depth:
+                self.loaded = False
+                continue
+            if self.depth < depth:
+                break
+
+            token = self._entry()
+            if token is not None:
+                yield from self._key_value(token, depth)
+            else:
+                self.loaded = False
+        yield _END_OBJECT
+
+    def _key_value(self, token: _LineToken, depth: int) -> Iterator[_Event]:
+        """Yield the events of an object field."""
+        yield "key", token.key
+        value_part = token.value
+
+        if token.header is not None:
+            length, delimiter, fields = token.header
+            self.loaded = False
+            if fields:
+                yield from self._tabular_array(depth + 1, length, delimiter or ",", fields)
+            elif not value_part:
+                yield from self._array_items(depth + 1, length, delimiter or ",")
+            else:
+                yield from self._inline_array(value_part, delimiter or ",", length)
+            return
+
+        if value_part:
+            value = self.decoder._parse_primitive(value_part)
+            self.loaded = False
+            yield "value", value
+            return
+
+        # Nested object or list items below, if they are indented deeper
+        self.loaded = False
+        if (yield from self._more()) and self.depth > depth:
+            if self.content.startswith("-"):
+                yield from self._list_items(depth + 1)
+            else:
+                yield from self._object(depth + 1)
+        else:
+            yield _NULL
+
+    def _array_items(self, depth: int, expected_length: int, delimiter: str) -> Iterator[_Event]:
+        """Yield the events of array items (list format with dashes)."""
+        yield "start_array", (expected_length, None)
+        count = 0
+        while self.loaded or (yield from self._more()):
+            if not self.content:
+                if self.strict:
+                    msg = "Blank lines not allowed inside arrays in strict mode"
+                    raise ToonParseError(msg)
+                self.loaded = False
+                continue
+            if self.depth < depth:
+                break
+            if self.depth > depth:
+                self.loaded = False
+                continue
+
+            token = self._lex()
+            if token.kind != _ITEM:
+                break
+            count += 1
+
+            if token.key is not None:
+                # List item starting an object: its first field is on the dash line
+                yield self.start_item
+                if token.value:
+                    value = self.decoder._parse_primitive(token.value)
+                    self.loaded = False
+                    yield "key", token.key
+                    yield "value", value
+                else:
+                    # Nested value below; at the end of input the field is left out
+                    self.loaded = False
+                    if (yield from self._more()):
+                        yield "key", token.key
+                        if self.depth > depth:
+                            yield from self._value_at_depth(depth + 1)
+                        else:
+                            yield _NULL
+
+                # More fields, one level deeper than the dash
+                while self.loaded or (yield from self._more()):
+                    if self.depth < depth + 1:
+                        break
+                    if self.depth > depth + 1:
+                        self.loaded = False
+                        continue
+                    if self.content.startswith("-"):
+                        break
+                    field = self._entry()
+                    if field is not None:
+                        yield from self._key_value(field, depth + 1)
+                    else:
+                        self.loaded = False
+                yield _END_OBJECT
+            elif token.content:
+                value = self.decoder._parse_primitive(token.content)
+                self.loaded = False
+                yield "value", value
+            else:
+                # A bare dash: an object with fields below, or an empty object
+                self.loaded = False
+                if (
+                    (yield from self._more())
+                    and self.depth > depth
+                    and not self.content.startswith("-")
+                ):
+                    yield from self._object(depth + 1)
+                else:
+                    yield _START_OBJECT
+                    yield _END_OBJECT
+
+        if self.strict and count != expected_length:
+            msg = f"Array count mismatch: expected {expected_length}, got {count}"
+            raise ToonParseError(msg)
+        yield _END_ARRAY
+
+    def _list_items(self, depth: int) -> Iterator[_Event]:
+        """Yield the events of list items without known length."""
+        yield "start_array", (None, None)
+        while self.loaded or (yield from self._more()):
+            if not self.content or self.depth > depth:
+                self.loaded = False
+                continue
+            if self.depth < depth:
+                break
+
+            token = self._lex()
+            if token.kind != _ITEM:
+                break
+
+            # A bare dash is an empty object; anything else a primitive
+            self.loaded = False
+            if token.content:
+                yield "value", self.decoder._parse_primitive(token.content)
+            else:
+                yield _START_OBJECT
+                yield _END_OBJECT
+        yield _END_ARRAY
+
+    def _value_at_depth(self, depth: int) -> Iterator[_Event]:
+        """Yield the events of a value starting at given depth."""
+        if self.content.startswith("-"):
+            yield from self._list_items(depth)
+        else:
+            yield from self._object(depth)
+
+    def _tabular_array(
+        self, depth: int, expected_length: int, delimiter: str, fields: list[str]
+    ) -> Iterator[_Event]:
+        """Yield the events of a tabular array, one per row."""
+        yield "start_array", (expected_length, fields)
+        parse = self.decoder._parse_primitive
+        count = 0
+        while self.loaded or (yield from self._more()):
+            if not self.content:
+                if self.strict:
+                    msg = "Blank lines not allowed inside tabular arrays in strict mode"
+                    raise ToonParseError(msg)
+                self.loaded = False
+                continue
+            if self.depth < depth:
+                break
+            if self.depth > depth:
+                self.loaded = False
+                continue
+
+            # A row has a delimiter before any colon (or no colon at all)
+            values = self.decoder._split_row(self.content, delimiter)
+            if values is None:
+                break
+            if self.strict and len(values) != len(fields):
+                msg = f"Row width mismatch: expected {len(fields)}, got {len(values)}"
+                raise ToonParseError(msg)
+            count += 1
+            self.loaded = False
+            yield "row", tuple(map(parse, values))
+
+        if self.strict and count != expected_length:
+            msg = f"Array count mismatch: expected {expected_length}, got {count}"
+            raise ToonParseError(msg)
+        yield _END_ARRAY
+
+    def _inline_array(self, content: str, delimiter: str, expected_length: int) -> Iterator[_Event]:
+        """Yield the events of an inline primitive array."""
+        values = self.decoder._parse_inline_array(content, delimiter, expected_length)
+        yield "start_array", (expected_length, None)
+        for value in values:
+            yield "value", value
+        yield _END_ARRAY
+
+
+class IncrementalToonDecoder:
+    """Decode TOON as it arrives in chunks, such as a response streamed from a model.
+
+    Each call to ``feed`` parses the lines its chunk completes and returns
+    the values they completed, so work can start on the first row or list
+    item while the rest of the document is still being written. A value is
+    complete once its line ends, or for objects and arrays, once a line
+    shows that nothing more belongs to them. Completed values are reported
+    as ``(path, value)`` pairs, where ``path`` holds the keys and list
+    indices leading to the value; containers follow their contents, and the
+    document itself is reported last, with the empty path.
+    """
+
+    def __init__(self, config: ToonParseConfig | None = None) -> None:
+        """Initialize the decoder with optional configuration."""
+        self.decoder = ToonDecoder(config)
+        self.config = self.decoder.config
+        self.result: Any = None  # The decoded document, once closed
+        self._parser = _EventParser(self.decoder, iter(()), closed=False, mark_items=True)
+        self._events = self._parser.events()
+        self._partial: list[str] = []  # Text of the line still being received
+        self._closed = False
+        # Open containers: the container, its path, its tabular fields, and whether
+        # dotted keys are expanded into it, which decode does for all objects but
+        # list items with their first field on the dash line
+        self._stack: list[tuple[dict[str, Any] | list[Any], _Path, list[str] | None, bool]] = []
+        self._expand_paths = self.config.expand_paths == "safe"
+        self._key = ""
+
+    def feed(self, chunk: str) -> list[tuple[_Path, Any]]:
+        """Parse the lines completed by a chunk of TOON text.
+
+        Args:
+            chunk: Next piece of the document, of any length
+
+        Returns:
+            List of ``(path, value)`` pairs for the values completed
+        """
+        if self._closed:
+            msg = "Cannot feed a closed decoder"
+            raise ValueError(msg)
+        if "\n" not in chunk:
+            self._partial.append(chunk)
+            return []
+        self._partial.append(chunk)
+        lines = "".join(self._partial).split("\n")
+        self._partial = [lines.pop()]
+        self._parser.lines = iter(lines)
+        return self._run()
+
+    def close(self) -> list[tuple[_Path, Any]]:
+        """Parse the rest of the document once all of it has been fed.
+
+        The last line needs no trailing newline. The decoded document is
+        also kept in ``result``.
+
+        Returns:
+            List of ``(path, value)`` pairs for the values completed, ending
+            with the document itself
+        """
+        if self._closed:
+            msg = "Cannot close a closed decoder"
+            raise ValueError(msg)
+        self._closed = True
+        rest = "".join(self._partial)
+        self._partial = []
+        self._parser.lines = iter([rest] if rest else [])
+        self._parser.closed = True
+        return self._run()
+
+    def _run(self) -> list[tuple[_Path, Any]]:
+        """Build values from the events of the lines supplied so far."""
+        completed: list[tuple[_Path, Any]] = []
+        stack = self._stack
+        for event, value in self._events:
+            if event == "key":
+                self._key = value
+            elif event == "value":
+                self._add(value, completed)
+            elif event == "row":
+                fields = stack[-1][2]
+                assert fields is not None
+                self._add(dict(zip(fields, value, strict=False)), completed)
+            elif event == "start_array":
+                stack.append(([], self._child_path(), value[1], False))
+            elif event == "start_object":
+                expand = self._expand_paths and value is None
+                stack.append(({}, self._child_path(), None, expand))
+            elif event == "end_object" or event == "end_array":
+                container, path, _, _ = stack.pop()
+                if path and isinstance(path[-1], str):
+                    self._key = path[-1]  # The key it is stored under, since replaced by its own
+                self._add(container, completed)
+            else:
+                break  # _NEED_LINE: wait for the next chunk
+        return completed
+
+    def _child_path(self) -> _Path:
+        """Return the path of the next value added to the open container."""
+        if not self._stack:
+            return ()
+        parent, path, _, _ = self._stack[-1]
+        if isinstance(parent, list):
+            return (*path, len(parent))
+        return (*path, self._key)
+
+    def _add(self, value: Any, completed: list[tuple[_Path, Any]]) -> None:  # noqa: ANN401
+        """Store a completed value in its container and report it."""
+        path = self._child_path()
+        if not self._stack:
+            self.result = value
+        else:
+            parent, _, _, expand = self._stack[-1]
+            if isinstance(parent, list):
+                parent.append(value)
+            elif expand and "." in self._key:
+                self.decoder._expand_path_into_object(parent, self._key, value)
+            else:
+                parent[self._key] = value
+        completed.append((path, value))
+
+
+@lru_cache(maxsize=64)
+def _depth_lines(low: int, high: int) -> re.Pattern[str]:
+    """Match the newline before each non-blank line indented by ``low`` to ``high`` spaces."""
+    return re.compile(rf"\n {{{low},{high}}}(?! )(?=[^\n]*\S)")
+
+
+@lru_cache(maxsize=8)
+def _misindented(indent_size: int) -> re.Pattern[str]:
+    """Match a non-blank line whose indentation is not a multiple of ``indent_size``."""
+    return re.compile(rf"\n(?: {{{indent_size}}})* {{1,{indent_size - 1}}}(?! )(?=[^\n]*\S)")
+
+
+def _line_at(text: str, start: int) -> str:
+    """Return the line starting at an offset, without its newline."""
+    stop = text.find("\n", start)
+    return text[start : len(text) if stop == -1 else stop]
+
+
+class _LazySource:
+    """The text of a lazily decoded document, and a decoder for parts of it."""
+
+    def __init__(self, text: str, config: ToonParseConfig) -> None:
+        """Initialize the source over a document."""
+        self.text = text
+        self.decoder = ToonDecoder(replace(config, lazy=False))
+        self.expand_paths = config.expand_paths == "safe"
+        # Parts of the document may be decoded from several threads
+        self.lock = threading.Lock()
+
+    def lines_at(self, depth: int, start: int, end: int) -> list[int]:
+        """Return the offsets of the non-blank lines at a depth between two line offsets."""
+        indent_size = self.decoder.config.indent_size
+        low = depth * indent_size
+        lines = _depth_lines(low, low + indent_size - 1)
+        # Matches start at the newline before a line, so the first line of the
+        # document is checked apart
+        if start:
+            return [match.start() + 1 for match in lines.finditer(self.text, start - 1, end)]
+        offsets = [match.start() + 1 for match in lines.finditer(self.text, 0, end)]
+        if lines.match("\n" + _line_at(self.text, 0)):
+            offsets.insert(0, 0)
+        return offsets
+
+    def parse(self, start: int, end: int, parse: Callable[[ToonDecoder], Any]) -> Any:  # noqa: ANN401
+        """Decode the lines from offset ``start`` through the line at offset ``end``.
+
+        The line at ``end``, which follows the part, is included because the
+        parser peeks at it, as it does when decoding the whole document.
+        """
+        text = self.text
+        stop = text.find("\n", end)
+        with self.lock:
+            self.decoder._index_lines(text[start : len(text) if stop == -1 else stop])
+            self.decoder.current_line = 0
+            try:
+                return parse(self.decoder)
+            finally:
+                self.decoder._release()
+
+    def decode(self) -> Any:  # noqa: ANN401
+        """Decode the whole document."""
+        with self.lock:
+            return self.decoder.decode(self.text)
+
+
+class LazyObject(Mapping[str, Any]):
+    """Object of a lazily decoded document, decoding each field when it is first accessed.
+
+    The fields are found from indentation alone, on first use. A field
+    holding an object is returned as another ``LazyObject``, and a field
+    holding an array with items below as a ``LazyArray``; decoded values
+    are cached. Errors in a part of the document are raised when that part
+    is decoded.
+    """
+
+    __slots__ = ("_depth", "_end", "_fields", "_source", "_start", "_values")
+
+    def __init__(self, source: _LazySource, start: int, end: int, depth: int) -> None:
+        """Initialize the object over the lines from offset ``start`` up to offset ``end``."""
+        self._source = source
+        self._start = start
+        self._end = end
+        self._depth = depth
+        # Key -> offsets of its line and of the next line at this depth, and its token
+        self._fields: dict[str, tuple[int, int, _LineToken]] | None = None
+        self._values: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:  # noqa: ANN401
+        """Return the value of a field, decoding it on first access."""
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        fields = self._index()
+        if key not in fields:
+            return self._values[key]  # Fields of an expanded object are all decoded
+        return self._values.setdefault(key, self._decode(*fields[key]))
+
+    def __contains__(self, key: object) -> bool:
+        """Check for a field without decoding it."""
+        return key in self._index() or key in self._values
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the keys in document order."""
+        fields = self._index()
+        return iter(fields or self._values)
+
+    def __len__(self) -> int:
+        """Return the number of fields."""
+        fields = self._index()
+        return len(fields or self._values)
+
+    def __repr__(self) -> str:
+        """Show the keys, but not the values, which may not be decoded yet."""
+        return f"LazyObject({list(self)!r})"
+
+    def _index(self) -> dict[str, tuple[int, int, _LineToken]]:
+        """Find the lines of the fields, on first use."""
+        if self._fields is not None:
+            return self._fields
+        source = self._source
+        decoder = source.decoder
+        text = source.text
+        starts = source.lines_at(self._depth, self._start, self._end)
+        starts.append(self._end)
+
+        fields: dict[str, tuple[int, int, _LineToken]] = {}
+        for start, end in zip(starts, starts[1:], strict=False):
+            content = _line_at(text, start).strip()
+            token = decoder._field(content, decoder._lex_text(content, items=True))
+            if token is None:
+                continue  # Skipped, as when decoding the whole document
+            assert token.key is not None
+            if source.expand_paths and "." in token.key:
+                # A dotted key merges into other fields, so the object is decoded whole
+                self._values = source.parse(
+                    self._start, self._end, partial(ToonDecoder._parse_object, depth=self._depth)
+                )
+                fields = {}
+                break
+            shadowed = fields.get(token.key)
+            if shadowed is not None:
+                # A repeated key keeps its place and takes its last value, but the
+                # earlier value is still decoded, so its errors are raised as by decode
+                self._parse(*shadowed)
+            fields[token.key] = (start, end, token)
+        self._fields = fields
+        return fields
+
+    def _decode(self, start: int, end: int, token: _LineToken) -> Any:  # noqa: ANN401
+        """Decode the value of the field on the line at ``start``, or return a proxy for it."""
+        depth = self._depth
+        source = self._source
+        if token.value:
+            return self._parse(start, end, token)  # A primitive or an inline array
+        if token.header is not None:
+            return LazyArray(partial(self._parse, start, end, token))
+
+        # Content indented below the field holds its value
+        text = source.text
+        below = text.find("\n", start, end) + 1
+        if not below:
+            return None
+        line = _line_at(text, below)
+        if (len(line) - len(line.lstrip(" "))) // source.decoder.config.indent_size <= depth:
+            return None
+        if line.strip().startswith("-"):
+            return LazyArray(partial(self._parse, start, end, token))
+        return LazyObject(source, below, end, depth + 1)
+
+    def _parse(self, start: int, end: int, token: _LineToken) -> Any:  # noqa: ANN401
+        """Decode the whole value of the field on the line at ``start``."""
+        depth = self._depth
+        return self._source.parse(
+            start, end, lambda decoder: decoder._parse_key_value(token, depth)[1]
+        )
+
+
+class LazyArray(Sequence[Any]):
+    """Array of a lazily decoded document, decoded whole when it is first used."""
+
+    __slots__ = ("_items", "_load")
+
+    def __init__(self, load: Callable[[], list[Any]]) -> None:
+        """Initialize the array with the function that decodes it."""
+        self._load: Callable[[], list[Any]] | None = load
+        self._items: list[Any] = []
+
+    @property
+    def items(self) -> list[Any]:
+        """The decoded items."""
+        if self._load is not None:
+            self._items = self._load()
+            self._load = None
+        return self._items
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...  # noqa: ANN401
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Any]: ...
+
+    def __getitem__(self, index: int | slice) -> Any:  # noqa: ANN401
+        """Return an item, or a list of items for a slice."""
+        return self.items[index]
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the items."""
+        return iter(self.items)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the items with another array or list."""
+        if isinstance(other, LazyArray):
+            return self.items == other.items
+        if isinstance(other, list):
+            return self.items == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Show the items, or that the array is not decoded yet."""
+        if self._load is not None:
+            return "LazyArray(...)"
+        return f"LazyArray({self._items!r})"
+
+
+def _decode_lazy(text: str, config: ToonParseConfig) -> Any:  # noqa: ANN401
+    """Index a document for lazy decoding, and return its root."""
+    source = _LazySource(text, config)
+    indent_size = config.indent_size
+    if config.strict and indent_size > 1:
+        misindented = _misindented(indent_size)
+        if misindented.match("\n" + _line_at(text, 0)) or misindented.search(text):
+            msg = f"Indentation must be multiple of {indent_size}"
+            raise ToonParseError(msg)
+
+    roots = source.lines_at(0, 0, len(text))
+    if not roots:
+        return source.decode()  # Empty, or all indented
+    content = _line_at(text, roots[0]).strip()
+    token = source.decoder._lex_text(content, items=True)
+    if token.kind == _HEADER and token.content.startswith("["):
+        return LazyArray(source.decode)
+    if token.key is None:
+        return source.decode()  # A primitive
+    return LazyObject(source, 0, len(text), 0)
+
+
+_DEFAULT_CONFIG = ToonParseConfig()
+
+_local = threading.local()
+
+
+def _shared_decoder(config: ToonParseConfig) -> ToonDecoder:
+    """Return a ready decoder for a config, set up once per thread.
+
+    Decoders hold the state of the document being parsed, so each thread
+    gets its own.
+    """
+    decoders: dict[ToonParseConfig, ToonDecoder] = _local.__dict__.setdefault("decoders", {})
+    decoder = decoders.get(config)
+    if decoder is None:
+        if len(decoders) >= _SHARED_DECODERS:
+            decoders.clear()
+        decoder = decoders[config] = ToonDecoder(config)
+    return decoder
+
+
 def toon_to_json(toon_string: str, config: ToonParseConfig | None = None) -> Any:  # noqa: ANN401
     """Convert TOON format string to Python object (JSON-compatible).
 
@@ -632,5 +1548,82 @@ def toon_to_json(toon_string: str, config: ToonParseConfig | None = None) -> Any
     Returns:
         Python object (dict, list, or primitive)
     """
-    decoder = ToonDecoder(config)
+    decoder = _shared_decoder(config or _DEFAULT_CONFIG)
     return decoder.decode(toon_string)
+
+
+def iter_rows(
+    source: str | Iterable[str],
+    path: str,
+    config: ToonParseConfig | None = None,
+    as_tuples: bool = False,
+) -> Iterator[dict[str, Any] | tuple[Any, ...]]:
+    """Stream the rows of one tabular array, without loading the document.
+
+    Lines before the array are parsed but not kept, each row is produced as
+    soon as its line is read, and reading stops once the declared number of
+    rows has been produced. In strict mode the line after the last row is
+    read as well, so the width and count checks still apply.
+
+    Args:
+        source: TOON string, text file or other iterable of lines
+        path: Key path of the array from the root, with nested keys joined by
+            dots (``"items"`` or ``"export.items"``)
+        config: Optional parsing configuration
+        as_tuples: Whether rows are tuples of values in field order instead
+            of dicts
+
+    Returns:
+        Iterator of rows
+    """
+    decoder = _shared_decoder(config or _DEFAULT_CONFIG)
+    return _rows_at(decoder.iterparse(source), path, decoder.config.strict, as_tuples)
+
+
+def _rows_at(
+    events: Iterator[_Event], path: str, strict: bool, as_tuples: bool
+) -> Iterator[dict[str, Any] | tuple[Any, ...]]:
+    """Yield the rows of the tabular array at a key path in an event stream."""
+    # Key path of each open container; None for arrays, whose items have no key path
+    paths: list[str | None] = []
+    key = ""
+    for event, value in events:
+        if event == "key":
+            key = value
+        elif event == "start_object" or event == "start_array":
+            if not paths:
+                own: str | None = ""  # The root
+            elif paths[-1] is None:
+                own = None
+            else:
+                own = f"{paths[-1]}.{key}" if paths[-1] else key
+            if event == "start_array":
+                length, fields = value
+                if own == path and fields is not None:
+                    yield from _table_rows(events, length, fields, strict, as_tuples)
+                    return
+                own = None
+            paths.append(own)
+        elif event == "end_object" or event == "end_array":
+            paths.pop()
+
+    msg = f"No tabular array at path: {path}"
+    raise ToonParseError(msg)
+
+
+def _table_rows(
+    events: Iterator[_Event], length: int, fields: list[str], strict: bool, as_tuples: bool
+) -> Iterator[dict[str, Any] | tuple[Any, ...]]:
+    """Yield the rows of a tabular array whose start event was just read."""
+    if length:
+        for count, (event, row) in enumerate(events, 1):
+            if event != "row":
+                return  # Fewer rows than declared; reported in strict mode
+            yield row if as_tuples else dict(zip(fields, row, strict=False))
+            if count == length:
+                break
+    if strict:
+        # The end of the array is where extra rows are reported
+        for event, _ in events:
+            if event == "end_array":
+                return
@@ -2,31 +2,391 @@
 
 from __future__ import annotations
 
-import math
+import copy
+import hashlib
+import io
+import pickle
 import re
-from dataclasses import dataclass
-from typing import Any
+import sys
+import tempfile
+from collections.abc import Callable, Collection, Iterator, Mapping, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, is_dataclass, replace
+from dataclasses import fields as dataclass_fields
+from functools import lru_cache
+from itertools import chain, islice, repeat
+from multiprocessing import get_all_start_methods, get_context
+from operator import attrgetter, itemgetter
+from typing import IO, TYPE_CHECKING, Any
 
-__all__ = ["ToonEncoder", "ToonConfig"]
+from json2toon.cache import SubtreeCache, SubtreeCacheInfo
+from json2toon.scalars import StringQuoter, format_number, format_numbers
 
+if TYPE_CHECKING:
+    from functools import _CacheInfo
 
-@dataclass
+__all__ = ["ToonEncoder", "ToonConfig", "TabularColumns", "CompiledEncoder"]
+
+# Indentation strings are precomputed up to this depth
+_INDENT_TABLE_DEPTH = 64
+
+# Columnar tables are formatted in blocks of this many rows to bound memory
+_TABLE_BLOCK_ROWS = 4096
+
+# Digits reserved for the count of streamed arrays written to seekable files
+_STREAM_COUNT_WIDTH = 12
+
+# Encoded rows of streamed arrays are kept in memory up to this size, then spooled to disk
+_SPOOL_MAX_MEMORY = 1 << 20
+
+# Arrays with less work than this are encoded serially even when workers are available.
+# benchmarks/parallel_threshold.py measures ~1.4 us per tabular cell serially, ~0.7 us
+# per cell to pickle it and its output across processes and ~0.25 s per started
+# worker, which breaks even at 1.3M cells for 4 workers and 1.8M for 8 (never for 2)
+_PARALLEL_MIN_CELLS = 2_000_000
+# Same for the items of nested and mixed arrays: ~15 us each serially and ~1.2 us to
+# pickle, breaking even at 50k items for 4 workers and 85k for 8
+_PARALLEL_MIN_ITEMS = 100_000
+
+# Smallest number of array items sent to a worker process at once
+_PARALLEL_MIN_CHUNK = 2_000
+
+# Keys written without quotes, and keys that may take part in key folding
+_UNQUOTED_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_.]*$")
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Ready encoders kept for json_to_toon and json_to_toon_stream, one per config
+_SHARED_ENCODERS = 32
+
+# Output lines are encoded to UTF-8 in batches of about this many characters
+_BYTES_CHUNK_CHARS = 1 << 16
+
+# Container values are looked up in the subtree cache down to this indentation depth;
+# deeper subtrees are cheap to re-encode compared to fingerprinting them separately
+_SUBTREE_CACHE_DEPTH = 2
+
+# Node generators yield finished lines, or (value, depth, key) for container
+# children so the engine decides how to descend into them
+_Item = str | tuple[Any, int, str | None]
+
+
+@dataclass(frozen=True, slots=True)
 class ToonConfig:
-    """Configuration options for TOON encoding."""
+    """Configuration options for TOON encoding.
+
+    Configs are immutable and hashable, so encoders built from them can be
+    shared and cached; use ``dataclasses.replace`` to derive a variant.
+    """
 
     indent_size: int = 2
     delimiter: str = ","
     key_folding: str | None = None  # "safe" or None
     strict: bool = True
+    quote_cache_size: int = 4096  # Cached quoting decisions for short strings (0 disables)
+    shape_cache_size: int = 1024  # Cached key tuples of repeated object shapes (0 disables)
+    engine: str = "recursive"  # "recursive" or "iterative" (no nesting depth limit)
+    default: Callable[[Any], Any] | None = None  # Converts values of unsupported types
+    subtree_cache: str | None = None  # "structure", "identity" or None (disabled)
+    subtree_cache_bytes: int = 64 << 20  # Memory budget of the subtree cache
+
+
+class TabularColumns:
+    """Column-oriented data encoded as a tabular array without building row objects.
+
+    Each column maps a field name to an equal-length sequence of primitives: a
+    list, an ``array.array`` or any object with ``tolist()`` such as a NumPy
+    array. Instances can be passed to ``ToonEncoder.encode_table`` or placed
+    anywhere in a document in place of a list of uniform objects.
+    """
+
+    __slots__ = ("columns", "length")
+
+    def __init__(self, columns: Mapping[str, Collection[Any]]) -> None:
+        """Wrap a mapping of field name to column."""
+        self.columns = dict(columns)
+        lengths = {len(column) for column in self.columns.values()}
+        if len(lengths) > 1:
+            msg = f"Columns must all have the same length, got lengths {sorted(lengths)}"
+            raise ValueError(msg)
+        self.length = lengths.pop() if lengths else 0
+
+
+_MISSING = object()
+
+# Kinds of values encoded as a single token
+_SCALAR_KINDS = frozenset(("null", "bool", "int", "float", "str"))
+
+# Kinds of values encoded on lines of their own, below their key
+_CONTAINER_KINDS = frozenset(("object", "record", "array", "table", "stream"))
+
+# Encoding kind of the concrete types a subclass may inherit from
+_BASE_KINDS: dict[type, str] = {
+    type(None): "null",
+    bool: "bool",
+    int: "int",
+    float: "float",
+    str: "str",
+    dict: "object",
+    list: "array",
+    tuple: "array",
+    TabularColumns: "table",
+}
+
+
+def _resolve_kind(t: type) -> str:
+    """Determine the encoding kind of a type not seen before.
+
+    Dataclasses and named tuples are records. Concrete base types are looked
+    up along the MRO next, so ``bool`` wins over ``int`` and subclasses behave
+    like their base. Abstract collections (which may be registered without
+    appearing in the MRO, such as ``MappingProxyType``) and ``__slots__``
+    classes outside the standard library are checked afterwards. Anything
+    else is ``"other"``.
+    """
+    if is_dataclass(t) or (issubclass(t, tuple) and hasattr(t, "_fields")):
+        return "record"
+    for base in t.__mro__:
+        kind = _BASE_KINDS.get(base)
+        if kind is not None:
+            return kind
+    if issubclass(t, Mapping):
+        return "object"
+    if issubclass(t, Sequence) and not issubclass(t, (bytes, bytearray, memoryview)):
+        return "array"
+    if issubclass(t, Iterator):
+        return "stream"
+    # Standard library classes (``UUID``, ...) keep their string form
+    if t.__module__.partition(".")[0] not in sys.stdlib_module_names and _slot_attributes(t):
+        return "record"
+    return "other"
+
+
+def _slot_attributes(t: type) -> tuple[str, ...]:
+    """Return the public slot attributes of a class whose instances have no ``__dict__``.
+
+    Classes with only private slots (``Fraction``, ``PurePath``, ...) hold
+    implementation state rather than fields, so they yield nothing.
+    """
+    names: list[str] = []
+    for base in reversed(t.__mro__[:-1]):  # Every class up to ``object``
+        slots = base.__dict__.get("__slots__")
+        if slots is None:
+            return ()
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name == "__dict__":
+                return ()
+            if not name.startswith("_"):
+                names.append(name)
+    return tuple(names)
+
+
+class _KindTable(dict[type, str]):
+    """Encoding kind per exact type, resolved once for each new type."""
+
+    def __missing__(self, t: type) -> str:
+        kind = self[t] = _resolve_kind(t)
+        return kind
+
+
+_KINDS = _KindTable(_BASE_KINDS)
+
+
+@dataclass(frozen=True, slots=True)
+class _RecordType:
+    """Fields of a record class and a getter of an instance's values in field order."""
+
+    fields: tuple[str, ...]
+    values: Callable[[Any], tuple[Any, ...]]
+
+
+def _build_record_type(t: type) -> _RecordType:
+    """Compute the field accessors of a dataclass, named tuple or ``__slots__`` class."""
+    if issubclass(t, tuple):
+        return _RecordType(getattr(t, "_fields"), tuple)  # noqa: B009
+    if is_dataclass(t):
+        names = tuple(field.name for field in dataclass_fields(t))
+    else:
+        names = _slot_attributes(t)
+    return _RecordType(names, _attr_getter(names))
+
+
+class _RecordTable(dict[type, _RecordType]):
+    """Field accessors per record class, computed once for each new class."""
+
+    def __missing__(self, t: type) -> _RecordType:
+        record_type = self[t] = _build_record_type(t)
+        return record_type
+
+
+_RECORD_TYPES = _RecordTable()
+
+
+class _PendingHeader(str):
+    """Tabular header written before its row count is known.
+
+    ``final`` receives the header with the real (equal-width) count once the
+    rows have been written, so a seekable sink can patch it in place.
+    """
+
+    final: str | None = None
+
+
+class _Unindented(str):
+    """Line of a value under an empty key, which is written without indentation.
+
+    It stays at the start of the line at any depth, so subtrees holding one
+    cannot be re-indented from the cache.
+    """
+
+
+@dataclass(frozen=True, slots=True)
+class _ArrayShape:
+    """Result of classifying an array for encoding.
+
+    ``kind`` is one of ``"tabular"``, ``"primitive"``, ``"nested"`` or ``"mixed"``.
+    For tabular arrays, ``fields`` holds the header fields in order,
+    ``columns`` the per-column kind: ``"str"`` (all strings), ``"num"``
+    (all non-boolean numbers) or ``"any"``, and ``getter`` returns the values
+    of a row in field order.
+    """
+
+    kind: str
+    fields: tuple[str, ...] = ()
+    columns: tuple[str, ...] = ()
+    getter: Callable[[Any], tuple[Any, ...]] | None = None
+
+
+_MIXED = _ArrayShape("mixed")
+
+# Array holding values of unsupported types that the ``default`` hook must convert first
+_UNRESOLVED = _ArrayShape("unresolved")
+
+
+@dataclass(frozen=True, slots=True)
+class _ObjectShape:
+    """Pre-rendered key information shared by all objects with the same key tuple.
+
+    ``keys`` holds the keys as written in ``key: value`` lines (quoted where
+    needed), ``header`` the ``{field,...}`` fragment of a tabular header, and
+    ``foldable`` whether a single-key object may take part in key folding.
+    """
+
+    fields: tuple[str, ...]
+    keys: tuple[str, ...]
+    header: str
+    foldable: bool
+
+
+# Keys, value getter and values of the first row of a streamed tabular array
+_StreamedRows = tuple[Collection[str], Callable[[Any], tuple[Any, ...]], tuple[Any, ...]]
+
+
+def _process_pool(
+    workers: int,
+    initializer: Callable[..., object] | None = None,
+    initargs: tuple[Any, ...] = (),
+) -> ProcessPoolExecutor:
+    """Create a process pool whose workers are started safely from a threaded program."""
+    # Forking a process that may be running threads can deadlock the children
+    method = "forkserver" if "forkserver" in get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(workers, get_context(method), initializer, initargs)
+
+
+def _unspool(spool: IO[bytes]) -> Iterator[tuple[Any, ...]]:
+    """Read back the row values written to a spool by ``_spool_rows``."""
+    while True:
+        try:
+            block = pickle.load(spool)
+        except EOFError:
+            return
+        yield from block
+
+
+def _is_primitive_type(t: type) -> bool:
+    """Check if values of a type are encoded as primitives."""
+    return _KINDS[t] in _SCALAR_KINDS
+
+
+def _column_kind(column_types: tuple[type, ...]) -> str:
+    """Summarize the value types seen in one tabular column."""
+    kinds = {_KINDS[t] for t in column_types}
+    if kinds == {"str"}:
+        return "str"
+    if kinds <= {"int", "float"}:
+        return "num"
+    return "any"
+
+
+def _format_null(value: None) -> str:
+    """Format ``None``."""
+    return "null"
+
+
+def _format_bool(value: bool) -> str:
+    """Format a boolean."""
+    return "true" if value else "false"
+
+
+def _row_getter(fields: tuple[str, ...]) -> Callable[[Any], tuple[Any, ...]]:
+    """Build a getter returning a row's values as a tuple in field order."""
+    if len(fields) == 1:
+        (field,) = fields
+        return lambda row: (row[field],)
+    if not fields:
+        return lambda row: ()
+    return itemgetter(*fields)
+
+
+def _attr_getter(attrs: tuple[str, ...]) -> Callable[[Any], tuple[Any, ...]]:
+    """Build a getter returning an object's attributes as a tuple in order."""
+    if len(attrs) == 1:
+        get = attrgetter(attrs[0])
+        return lambda obj: (get(obj),)
+    if not attrs:
+        return lambda obj: ()
+    return attrgetter(*attrs)
+
+
+def _members(value: Any, kind: str) -> tuple[tuple[str, ...], Collection[Any]]:  # noqa: ANN401
+    """Return the field names and values of an object or record."""
+    if kind == "record":
+        record_type = _RECORD_TYPES[type(value)]
+        return record_type.fields, record_type.values(value)
+    return tuple(value), value.values()
 
 
 class ToonEncoder:
     """Encodes Python objects to TOON format."""
 
+    # Width of the placeholder count of streamed arrays; 0 spools rows instead
+    _count_width = 0
+
+    # Process pool large arrays are fanned out to, and its size
+    _pool: Executor | None = None
+    _workers = 1
+
     def __init__(self, config: ToonConfig | None = None) -> None:
         """Initialize the encoder with optional configuration."""
         self.config = config or ToonConfig()
         self._validate_config()
+        self._quoter = StringQuoter(self.config.delimiter, self.config.quote_cache_size)
+        self._shape_of = lru_cache(maxsize=self.config.shape_cache_size)(self._build_shape)
+        self._indents = [" " * (d * self.config.indent_size) for d in range(_INDENT_TABLE_DEPTH)]
+        # Marker of non-comma delimiters in array headers
+        self._delimiter_marker = "" if self.config.delimiter == "," else self.config.delimiter
+        # Scalar formatter per encoding kind
+        self._formatters: dict[str, Callable[[Any], str]] = {
+            "null": _format_null,
+            "bool": _format_bool,
+            "int": int.__repr__,
+            "float": format_number,
+            "str": self._quoter.quote,
+            "other": self._format_other,
+        }
+        self._subtrees = (
+            SubtreeCache(self.config.subtree_cache_bytes) if self.config.subtree_cache else None
+        )
 
     def _validate_config(self) -> None:
         """Validate configuration options."""
@@ -39,11 +399,305 @@ class ToonEncoder:
         if self.config.indent_size < 1:
             msg = f"Invalid indent_size: {self.config.indent_size}"
             raise ValueError(msg)
+        if self.config.quote_cache_size < 0:
+            msg = f"Invalid quote_cache_size: {self.config.quote_cache_size}"
+            raise ValueError(msg)
+        if self.config.shape_cache_size < 0:
+            msg = f"Invalid shape_cache_size: {self.config.shape_cache_size}"
+            raise ValueError(msg)
+        if self.config.engine not in ("recursive", "iterative"):
+            msg = f"Invalid engine: {self.config.engine!r}"
+            raise ValueError(msg)
+        if self.config.default is not None and not callable(self.config.default):
+            msg = f"Invalid default: {self.config.default!r} is not callable"
+            raise ValueError(msg)
+        if self.config.subtree_cache not in (None, "structure", "identity"):
+            msg = f"Invalid subtree_cache: {self.config.subtree_cache!r}"
+            raise ValueError(msg)
+        if self.config.subtree_cache_bytes < 0:
+            msg = f"Invalid subtree_cache_bytes: {self.config.subtree_cache_bytes}"
+            raise ValueError(msg)
+
+    def encode(self, data: Any, workers: int | None = None) -> str:  # noqa: ANN401
+        """Encode Python data to TOON format string.
+
+        Args:
+            data: Python object to encode
+            workers: Number of processes to encode large arrays in; the output is
+                identical to serial encoding. ``None`` or 1 encodes serially.
+
+        Returns:
+            TOON format string
+        """
+        with self._parallel(workers) as encoder:
+            return "\n".join(encoder._lines(data))
+
+    def iterencode(self, data: Any, workers: int | None = None) -> Iterator[str]:  # noqa: ANN401
+        """Encode Python data to TOON, yielding output chunks as the tree is walked.
+
+        Joining the chunks gives exactly the string returned by ``encode``.
+        """
+        with self._parallel(workers) as encoder:
+            lines = encoder._lines(data)
+            first = next(lines, None)
+            if first is None:
+                return
+            yield first
+            for line in lines:
+                yield "\n" + line
+
+    def encode_bytes(self, data: Any, workers: int | None = None) -> bytes:  # noqa: ANN401
+        """Encode Python data to UTF-8 encoded TOON without building the whole string first.
+
+        Returns the same bytes as ``encode(data).encode("utf-8")``; ``workers``
+        is handled as in ``encode``.
+        """
+        return b"".join(self._utf8_chunks(data, workers))
+
+    def encode_into(
+        self,
+        data: Any,  # noqa: ANN401
+        buf: bytearray,
+        workers: int | None = None,
+    ) -> int:
+        """Encode Python data as UTF-8 and append it to a caller-owned buffer.
+
+        Output is encoded in batches of lines straight into ``buf``, so no full
+        size ``str`` or ``bytes`` copy of the document is made. A buffer can be
+        cleared and reused across calls, as long as no ``memoryview`` of it is
+        still alive when it has to grow.
+
+        Args:
+            data: Python object to encode
+            buf: Buffer the encoded document is appended to
+            workers: Optional number of processes to encode large arrays in
+
+        Returns:
+            Number of bytes appended; ``memoryview(buf)[len(buf) - n :]`` is
+            the document (``[-n:]`` would be the whole buffer when ``n`` is 0)
+        """
+        start = len(buf)
+        for chunk in self._utf8_chunks(data, workers):
+            buf += chunk
+        return len(buf) - start
+
+    def _utf8_chunks(self, data: Any, workers: int | None) -> Iterator[bytes]:  # noqa: ANN401
+        """Yield the UTF-8 encoded output in chunks of many lines."""
+        with self._parallel(workers) as encoder:
+            batch: list[str] = []
+            size = 0
+            for line in encoder._lines(data):
+                batch.append(line)
+                size += len(line)
+                if size >= _BYTES_CHUNK_CHARS:
+                    yield "\n".join(batch).encode()
+                    batch = [""]  # Later chunks start with the newline ending the previous line
+                    size = 0
+            if len(batch) > 1 or (batch and batch[0]):
+                yield "\n".join(batch).encode()
+
+    def dump(self, data: Any, fp: IO[str], workers: int | None = None) -> None:  # noqa: ANN401
+        """Encode Python data and write it to a text file-like object.
+
+        Iterators in the data are encoded as arrays without being materialized.
+        On a seekable file their tabular rows are written directly and the count
+        is back-patched into a zero-padded, fixed-width ``[N]`` field; other
+        sinks, including files opened for appending, get the exact ``encode``
+        output with rows spooled to a temp file. ``workers`` is handled as in
+        ``encode``.
+        """
+        seekable = getattr(fp, "seekable", None)
+        mode = getattr(fp, "mode", "")
+        # Writes to a file opened for appending always go to its end, so nothing can be patched
+        if not (seekable and seekable()) or (isinstance(mode, str) and "a" in mode):
+            fp.writelines(self.iterencode(data, workers))
+            return
+
+        with self._parallel(workers) as encoder:
+            encoder._dump_seekable(data, fp)
+
+    def _dump_seekable(self, data: Any, fp: IO[str]) -> None:  # noqa: ANN401
+        """Write data to a seekable file, back-patching the counts of streamed arrays."""
+        encoder = copy.copy(self)
+        encoder._count_width = _STREAM_COUNT_WIDTH
+        pending: list[tuple[int, _PendingHeader]] = []
+        separator = ""
+        for line in encoder._lines(data):
+            fp.write(separator)
+            separator = "\n"
+            if isinstance(line, _PendingHeader):
+                pending.append((fp.tell(), line))
+            fp.write(line)
+
+        if pending:
+            for position, header in pending:
+                fp.seek(position)
+                fp.write(header.final or header)
+            fp.seek(0, io.SEEK_END)
+
+    def encode_table(
+        self, columns: TabularColumns | Mapping[str, Collection[Any]], key: str | None = None
+    ) -> str:
+        """Encode column-oriented data as a tabular array.
+
+        Args:
+            columns: Mapping of field name to column, or a ``TabularColumns``
+            key: Optional key to nest the table under; encoded as a root array if omitted
+
+        Returns:
+            TOON format string
+        """
+        table = columns if isinstance(columns, TabularColumns) else TabularColumns(columns)
+        return self.encode(table if key is None else {key: table})
+
+    def compile(self, shape: Mapping[str, Any]) -> CompiledEncoder:
+        """Compile an encoder specialized for records of one fixed shape.
+
+        Args:
+            shape: Example record, or a mapping of field name to type; nested
+                mappings describe nested objects
+
+        Returns:
+            A ``CompiledEncoder`` producing the same output as this encoder
+        """
+        return CompiledEncoder(self, shape)
+
+    @contextmanager
+    def _parallel(self, workers: int | None) -> Iterator[ToonEncoder]:
+        """Provide an encoder fanning large arrays out to ``workers`` processes.
+
+        Worker processes are only started once an array reaches the
+        parallel threshold, so small documents never pay for the pool.
+        """
+        if workers is None or workers == 1:
+            yield self
+            return
+        if workers < 1:
+            msg = f"Invalid workers: {workers}"
+            raise ValueError(msg)
 
-    def encode(self, data: Any) -> str:  # noqa: ANN401
-        """Encode Python data to TOON format string."""
-        lines = self._encode_value(data, depth=0, is_root=True)
-        return "\n".join(lines) if lines else ""
+        with _process_pool(workers, _init_worker, (self.config,)) as pool:
+            encoder = copy.copy(self)
+            encoder._pool = pool
+            encoder._workers = workers
+            yield encoder
+
+    def _map_chunks(
+        self, task: Callable[..., str], items: Sequence[Any], *args: Any
+    ) -> Iterator[str]:
+        """Run ``task(chunk, *args)`` over chunks of items in the pool, in order.
+
+        Each result holds the lines of one chunk joined by newlines, which is
+        what the engine would have joined them with, so results can be emitted
+        as single lines.
+        """
+        assert self._pool is not None
+        size = max(_PARALLEL_MIN_CHUNK, -(-len(items) // (self._workers * 4)))
+        it = iter(items)
+        chunks = iter(lambda: list(islice(it, size)), [])
+        return self._pool.map(task, chunks, *(repeat(arg) for arg in args))
+
+    def _lines(self, data: Any) -> Iterator[str]:  # noqa: ANN401
+        """Yield the output lines of a document using the configured engine."""
+        return self._walk(self._encode_value(data, depth=0, is_root=True))
+
+    def _walk(self, items: Iterator[_Item]) -> Iterator[str]:
+        """Resolve node items into lines using the configured engine."""
+        if self.config.engine == "iterative":
+            return self._walk_iterative(items)
+        return self._walk_recursive(items)
+
+    def _walk_recursive(self, items: Iterator[_Item]) -> Iterator[str]:
+        """Resolve child values by recursing into them (default engine)."""
+        for item in items:
+            if isinstance(item, str):
+                yield item
+            else:
+                value, depth, key = item
+                if self._subtrees is not None and depth < _SUBTREE_CACHE_DEPTH:
+                    yield from self._cached_subtree(value, depth, key)
+                else:
+                    yield from self._walk_recursive(self._encode_value(value, depth, key=key))
+
+    def _walk_iterative(self, items: Iterator[_Item]) -> Iterator[str]:
+        """Resolve child values with an explicit stack instead of recursion.
+
+        Each stack entry is a suspended node generator, so nesting depth is only
+        bounded by memory rather than by the interpreter's recursion limit.
+        """
+        stack = [items]
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, str):
+                    yield item
+                else:
+                    value, depth, key = item
+                    if self._subtrees is not None and depth < _SUBTREE_CACHE_DEPTH:
+                        yield from self._cached_subtree(value, depth, key)
+                        continue
+                    stack.append(self._encode_value(value, depth, key=key))
+                    break
+            else:
+                stack.pop()
+
+    def _cached_subtree(
+        self,
+        value: Any,  # noqa: ANN401
+        depth: int,
+        key: str | None,
+    ) -> Iterator[str]:
+        """Yield the lines of a container child, reusing them from the subtree cache.
+
+        Subtrees are cached with the indentation of their depth removed, so a
+        subtree moved to another depth is re-indented rather than re-encoded.
+        The lines are yielded joined, as one multi-line item.
+        """
+        cache = self._subtrees
+        assert cache is not None
+        prefix = self._indent(depth)
+        ref = value if self.config.subtree_cache == "identity" else None
+        cache_key = self._subtree_key(value, key)
+
+        text = None if cache_key is None else cache.get(cache_key, ref)
+        if text is None:
+            lines = list(self._walk(self._encode_value(value, depth, key=key)))
+            streamed = any(isinstance(line, _PendingHeader) for line in lines)
+            if streamed:
+                # Streamed arrays are one-shot; use their final counts and keep them out
+                lines = [
+                    line.final or line if isinstance(line, _PendingHeader) else line
+                    for line in lines
+                ]
+                cache_key = None
+            text = "\n".join(lines)
+            if any(isinstance(line, _Unindented) for line in lines) or (
+                prefix
+                and not (text.startswith(prefix) and text.count("\n") == text.count("\n" + prefix))
+            ):
+                # Lines under an empty key are not indented, so they cannot be re-indented.
+                # They are marked even at depth 0, where all lines start unindented, and
+                # the text stays marked so that enclosing subtrees are not cached either.
+                if text:
+                    yield _Unindented(text)
+                return
+            text = text[len(prefix) :].replace("\n" + prefix, "\n")
+            if cache_key is not None:
+                cache.put(cache_key, text, ref)
+
+        if text:  # Nothing at all for an empty object without a key
+            yield prefix + text.replace("\n", "\n" + prefix) if prefix else text
+
+    def _subtree_key(self, value: Any, key: str | None) -> tuple[Any, ...] | None:  # noqa: ANN401
+        """Key a subtree by identity or by a digest of its structure; ``None`` if uncacheable."""
+        if self.config.subtree_cache == "identity":
+            return key, id(value)
+        try:
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None  # Iterators, lambdas and other values without a stable structure
+        except RecursionError:
+            return None  # Nested deeper than pickle can go; left to the iterative engine
+        return key, hashlib.blake2b(data, digest_size=16).digest()
 
     def _encode_value(
         self,
@@ -51,87 +705,107 @@ class ToonEncoder:
         depth: int,
         is_root: bool = False,
         key: str | None = None,  # noqa: ANN401
-    ) -> list[str]:
-        """Encode a value at a given depth."""
-        if value is None or (isinstance(value, float) and (math.isnan(value) or math.isinf(value))):
-            return [f"{self._indent(depth)}{key}: null"] if key else ["null"]
-
-        if isinstance(value, bool):
-            bool_str = "true" if value else "false"
-            return [f"{self._indent(depth)}{key}: {bool_str}"] if key else [bool_str]
-
-        if isinstance(value, (int, float)):
-            num_str = self._canonicalize_number(value)
-            return [f"{self._indent(depth)}{key}: {num_str}"] if key else [num_str]
-
-        if isinstance(value, str):
-            quoted = self._quote_string(value, self.config.delimiter)
-            return [f"{self._indent(depth)}{key}: {quoted}"] if key else [quoted]
-
-        if isinstance(value, list):
-            return self._encode_array(value, depth, key, is_root)
-
-        if isinstance(value, dict):
-            return self._encode_object(value, depth, key, is_root)
-
-        # Fallback for unsupported types
-        return self._encode_value(str(value), depth, is_root, key)
+    ) -> Iterator[_Item]:
+        """Encode a value at a given depth, yielding output lines and child values."""
+        value, kind = self._kind_of(value)
+        if kind == "array":
+            yield from self._encode_array(value, depth, key, is_root)
+        elif kind == "object":
+            yield from self._encode_object(tuple(value), value.values(), depth, key, is_root)
+        elif kind == "record":
+            record_type = _RECORD_TYPES[type(value)]
+            yield from self._encode_object(
+                record_type.fields, record_type.values(value), depth, key, is_root
+            )
+        elif kind == "table":
+            yield from self._encode_columns(value, depth, key, is_root)
+        elif kind == "stream":
+            yield from self._encode_stream(value, depth, key, is_root)
+        else:
+            yield self._encode_scalar(value, depth, key)
+
+    def _kind_of(self, value: Any) -> tuple[Any, str]:  # noqa: ANN401
+        """Return a value and its encoding kind, converting unsupported types with ``default``."""
+        kind = _KINDS[type(value)]
+        if kind == "other" and self.config.default is not None:
+            value = self.config.default(value)
+            kind = _KINDS[type(value)]
+        return value, kind
+
+    def _encode_scalar(self, value: Any, depth: int, key: str | None) -> str:  # noqa: ANN401
+        """Encode a primitive (or unsupported) value as a single line."""
+        text = self._formatters[_KINDS[type(value)]](value)
+        if key:
+            return f"{self._indent(depth)}{key}: {text}"
+        return _Unindented(text) if key == "" else text
+
+    def _format_other(self, value: Any) -> str:  # noqa: ANN401
+        """Fallback for unsupported types: their quoted string form."""
+        return self._quoter.quote(str(value))
+
+    def _child(self, value: Any, depth: int, key: str | None) -> _Item:  # noqa: ANN401
+        """Return a primitive child as its line, or a container child for the engine."""
+        kind = _KINDS[type(value)]
+        if kind == "other" and self.config.default is not None:
+            value, kind = self._kind_of(value)
+        if kind in _CONTAINER_KINDS:
+            return value, depth, key
+        text = self._formatters[kind](value)
+        if key:
+            return f"{self._indent(depth)}{key}: {text}"
+        return _Unindented(text) if key == "" else text
 
     def _encode_object(
-        self, obj: dict[str, Any], depth: int, parent_key: str | None, is_root: bool
-    ) -> list[str]:
-        """Encode a dictionary object."""
-        if not obj:  # Empty object
-            return [] if is_root else [f"{self._indent(depth)}{parent_key}:"] if parent_key else []
-
-        lines: list[str] = []
+        self,
+        fields: tuple[str, ...],
+        values: Collection[Any],
+        depth: int,
+        parent_key: str | None,
+        is_root: bool,
+    ) -> Iterator[_Item]:
+        """Encode the fields of a dictionary object or record."""
+        if not fields:  # Empty object
+            if parent_key and not is_root:
+                yield f"{self._indent(depth)}{parent_key}:"
+            return
 
         # Add parent key if not root
         if parent_key and not is_root:
-            lines.append(f"{self._indent(depth)}{parent_key}:")
+            yield f"{self._indent(depth)}{parent_key}:"
             depth += 1
 
+        shape = self._shape_of(fields)
+
         # Apply key folding if enabled
-        if self.config.key_folding == "safe" and len(obj) == 1:
-            single_key = next(iter(obj))
-            single_value = obj[single_key]
+        if self.config.key_folding == "safe" and shape.foldable:
+            single_value = next(iter(values))
+            kind = _KINDS[type(single_value)]
 
             # Check if we can fold
-            if (
-                isinstance(single_value, dict)
-                and self._is_valid_identifier(single_key)
-                and "." not in single_key
-            ):
+            if kind in ("object", "record"):
                 # Recursively fold
-                folded_key = single_key
+                folded_key = shape.fields[0]
                 current_value = single_value
 
-                while isinstance(current_value, dict) and len(current_value) == 1:
-                    next_key = next(iter(current_value))
-                    if not self._is_valid_identifier(next_key) or "." in next_key:
+                while kind in ("object", "record"):
+                    next_fields, next_values = _members(current_value, kind)
+                    if len(next_fields) != 1 or not self._shape_of(next_fields).foldable:
                         break
-                    folded_key = f"{folded_key}.{next_key}"
-                    current_value = current_value[next_key]
+                    folded_key = f"{folded_key}.{next_fields[0]}"
+                    current_value = next(iter(next_values))
+                    kind = _KINDS[type(current_value)]
 
                 # Encode with folded key
-                child_lines = self._encode_value(current_value, depth, key=folded_key)
-                lines.extend(child_lines)
-                return lines
-
-        # Normal object encoding
-        for k, v in obj.items():
-            if not self._is_valid_unquoted_key(k):
-                # Quote the key if it's not valid
-                k = self._quote_string(k, self.config.delimiter)
-
-            child_lines = self._encode_value(v, depth, key=k)
-            lines.extend(child_lines)
+                yield self._child(current_value, depth, folded_key)
+                return
 
-        return lines
+        # Normal object encoding, with keys quoted where needed
+        for k, v in zip(shape.keys, values, strict=True):
+            yield self._child(v, depth, k)
 
     def _encode_array(
-        self, arr: list[Any], depth: int, key: str | None, is_root: bool
-    ) -> list[str]:
+        self, arr: Sequence[Any], depth: int, key: str | None, is_root: bool
+    ) -> Iterator[_Item]:
         """Encode an array with appropriate format."""
         if not arr:  # Empty array
             header = "[0]:"
@@ -139,114 +813,333 @@ class ToonEncoder:
                 header = f"{key}{header}"
             if not is_root:
                 header = f"{self._indent(depth)}{header}"
-            return [header]
-
-        # Detect array format
-        if self._is_tabular_array(arr):
-            return self._encode_tabular_array(arr, depth, key, is_root)
-        if self._is_primitive_array(arr):
-            return self._encode_primitive_array(arr, depth, key, is_root)
-        if self._is_nested_array(arr):
-            return self._encode_nested_array(arr, depth, key, is_root)
-
-        # Mixed/non-uniform array
-        return self._encode_mixed_array(arr, depth, key, is_root)
+            yield header
+            return
+
+        # Detect array format in a single pass
+        shape = self._classify_array(arr)
+        if shape is _UNRESOLVED:
+            # Convert unsupported values first, then classify what they became
+            arr = [self._resolve_item(item) for item in arr]
+            shape = self._classify_array(arr)
+            if shape is _UNRESOLVED:
+                shape = _MIXED
+
+        if shape.kind == "tabular":
+            yield from self._encode_tabular_array(arr, depth, key, is_root, shape)
+        elif shape.kind == "primitive":
+            yield from self._encode_primitive_array(arr, depth, key, is_root)
+        elif shape.kind == "nested":
+            yield from self._encode_nested_array(arr, depth, key, is_root)
+        else:
+            # Mixed/non-uniform array
+            yield from self._encode_mixed_array(arr, depth, key, is_root)
+
+    def _classify_array(self, arr: Sequence[Any]) -> _ArrayShape:
+        """Classify a non-empty array as tabular, primitive, nested or mixed.
+
+        The kinds are mutually exclusive once the first item is known, so the
+        array is scanned at most once and the scan stops at the first item that
+        rules the candidate kind out. Arrays whose classification depends on
+        values the ``default`` hook has yet to convert are reported as unresolved.
+        """
+        first_kind = _KINDS[type(arr[0])]
+        if first_kind == "object":
+            return self._classify_rows(arr)
+        if first_kind == "record":
+            return self._classify_records(arr)
+
+        kinds = {_KINDS[t] for t in set(map(type, arr))}
+        if kinds <= _SCALAR_KINDS:
+            return _ArrayShape("primitive")
+        if kinds == {"array"}:
+            return _ArrayShape("nested")
+        if "other" in kinds and self.config.default is not None:
+            return _UNRESOLVED
+        return _MIXED
+
+    def _classify_rows(self, arr: Sequence[Any]) -> _ArrayShape:
+        """Check whether an array of objects is uniform enough for tabular format."""
+        first_keys = arr[0].keys()
+        fields = tuple(first_keys)
+        getter = _row_getter(fields)
+
+        # Collect the distinct per-row type signatures; homogeneous data has very few
+        signatures: set[tuple[type, ...]] = set()
+        for item in arr:
+            if _KINDS[type(item)] != "object" or item.keys() != first_keys:
+                return _MIXED
+            signatures.add(tuple(map(type, getter(item))))
 
-    def _is_tabular_array(self, arr: list[Any]) -> bool:
-        """Check if array should be encoded in tabular format."""
-        if not arr or not all(isinstance(item, dict) for item in arr):
-            return False
+        return self._tabular_shape(fields, getter, signatures)
 
-        # Get keys from first object
-        first_keys = set(arr[0].keys())
+    def _classify_records(self, arr: Sequence[Any]) -> _ArrayShape:
+        """Check whether an array of records is tabular; fields come from the class."""
+        record_type = type(arr[0])
+        fields = _RECORD_TYPES[record_type].fields
+        getter = _RECORD_TYPES[record_type].values
 
-        # Check all objects have same keys and all values are primitives
+        signatures: set[tuple[type, ...]] = set()
         for item in arr:
-            if set(item.keys()) != first_keys:
-                return False
-            if not all(self._is_primitive(v) for v in item.values()):
-                return False
+            if type(item) is not record_type:
+                return _MIXED
+            signatures.add(tuple(map(type, getter(item))))
 
-        return True
+        return self._tabular_shape(fields, getter, signatures)
 
-    def _is_primitive_array(self, arr: list[Any]) -> bool:
-        """Check if array contains only primitives."""
-        return all(self._is_primitive(item) for item in arr)
-
-    def _is_nested_array(self, arr: list[Any]) -> bool:
-        """Check if array contains only arrays."""
-        return all(isinstance(item, list) for item in arr)
-
-    def _is_primitive(self, value: Any) -> bool:  # noqa: ANN401
-        """Check if value is a primitive type."""
-        return value is None or isinstance(value, (bool, int, float, str))
+    def _tabular_shape(
+        self,
+        fields: tuple[str, ...],
+        getter: Callable[[Any], tuple[Any, ...]],
+        signatures: set[tuple[type, ...]],
+    ) -> _ArrayShape:
+        """Derive the column kinds of uniform rows from their distinct type signatures."""
+        columns = []
+        unresolved = False
+        for column_types in zip(*signatures, strict=True):
+            kinds = {_KINDS[t] for t in column_types}
+            if not kinds <= _SCALAR_KINDS:
+                if kinds - _SCALAR_KINDS != {"other"} or self.config.default is None:
+                    return _MIXED
+                unresolved = True
+            columns.append(_column_kind(column_types))
+
+        if unresolved:
+            return _UNRESOLVED
+        return _ArrayShape("tabular", fields, tuple(columns), getter)
+
+    def _resolve_item(self, item: Any) -> Any:  # noqa: ANN401
+        """Convert an array item, or the values of an object item, with ``default``."""
+        item, kind = self._kind_of(item)
+        if kind in ("object", "record"):
+            fields, values = _members(item, kind)
+            return {k: self._kind_of(v)[0] for k, v in zip(fields, values, strict=True)}
+        return item
 
     def _encode_tabular_array(
-        self, arr: list[dict[str, Any]], depth: int, key: str | None, is_root: bool
-    ) -> list[str]:
-        """Encode uniform array of objects in tabular format."""
-        lines: list[str] = []
-
-        # Get field names from first object (preserve order)
-        fields = list(arr[0].keys())
-        field_names = self.config.delimiter.join(fields)
-
-        # Build header
-        delim_marker = ""
-        if self.config.delimiter == "\t":
-            delim_marker = "\t"
-        elif self.config.delimiter == "|":
-            delim_marker = "|"
-
-        header = f"[{len(arr)}{delim_marker}]{{{field_names}}}:"
+        self,
+        arr: Sequence[Any],
+        depth: int,
+        key: str | None,
+        is_root: bool,
+        shape: _ArrayShape,
+    ) -> Iterator[str]:
+        """Encode uniform array of objects or records in tabular format."""
+        yield self._tabular_header(len(arr), shape.fields, depth, key, is_root)
+
+        prefix = self._indent(depth + 1 if not is_root or key else depth)
+        if self._pool is not None and len(arr) * len(shape.fields) >= _PARALLEL_MIN_CELLS:
+            # Getters may be lambdas, so workers rebuild them from the rows
+            yield from self._map_chunks(_encode_rows_task, arr, replace(shape, getter=None), prefix)
+            return
+        yield from self._tabular_rows(arr, shape, prefix)
+
+    def _tabular_rows(self, arr: Sequence[Any], shape: _ArrayShape, prefix: str) -> Iterator[str]:
+        """Format the rows of a tabular array."""
+        delimiter = self.config.delimiter
+        fields = shape.fields
+
+        # Resolve one formatter per column from the classifier's findings
+        formatters = [self._column_formatter(kind) for kind in shape.columns]
+        getter = shape.getter or _row_getter(fields)
+
+        # Encode rows, transposing a block of rows to format whole columns at a time
+        rows = iter(arr)
+        while block := list(islice(rows, _TABLE_BLOCK_ROWS)):
+            columns = zip(*map(getter, block), strict=True) if fields else ()
+            cells = [fmt(column) for fmt, column in zip(formatters, columns, strict=True)]
+            for row in zip(*cells, strict=True) if cells else [()] * len(block):
+                yield f"{prefix}{delimiter.join(row)}"
+
+    def _tabular_header(
+        self, length: int | str, fields: tuple[str, ...], depth: int, key: str | None, is_root: bool
+    ) -> str:
+        """Build the ``key[N]{fields}:`` header line of a tabular array."""
+        header = f"[{length}{self._delimiter_marker}]{self._shape_of(fields).header}:"
 
         if key:
             header = f"{key}{header}"
         if not is_root:
             header = f"{self._indent(depth)}{header}"
-
-        lines.append(header)
-
-        # Encode rows
-        row_depth = depth + 1 if not is_root or key else depth
-        for obj in arr:
-            encoded_values = []
-            for f in fields:
-                val = obj[f]
-                # Only quote actual string values, not primitives converted to strings
-                if isinstance(val, str):
-                    # Original value is a string, quote if necessary
-                    if self._needs_quoting(val, self.config.delimiter):
-                        encoded_values.append(self._quote_string(val, self.config.delimiter))
-                    else:
-                        encoded_values.append(val)
-                else:
-                    # Original value is number/bool/null, convert to string but don't quote
-                    normalized = self._normalize_value(val)
-                    encoded_values.append(str(normalized))
-            row = self.config.delimiter.join(encoded_values)
-            lines.append(f"{self._indent(row_depth)}{row}")
-
-        return lines
+        return header
+
+    def _encode_stream(
+        self, items: Iterator[Any], depth: int, key: str | None, is_root: bool
+    ) -> Iterator[_Item]:
+        """Encode an iterator as an array.
+
+        Uniform objects with primitive values are streamed as tabular rows, so
+        memory stays proportional to one row. Anything else (primitives, nested
+        or mixed items) has to be classified as a whole and is materialized.
+        """
+        first: Any = next(items, _MISSING)
+        if first is _MISSING:
+            yield from self._encode_array([], depth, key, is_root)
+            return
+        first, kind = self._kind_of(first)
+        first_values = None
+        if kind == "object":
+            fields = tuple(first)
+            getter = _row_getter(fields)
+            first_values = self._row_values(first, first.keys(), getter)
+        if first_values is None:
+            yield from self._encode_array([first, *items], depth, key, is_root)
+            return
+        rows = (first.keys(), getter, first_values)
+        prefix = self._indent(depth + 1 if not is_root or key else depth)
+
+        if self._count_width:
+            # Seekable sink: reserve a fixed-width count and patch it afterwards
+            header = _PendingHeader(
+                self._tabular_header("0" * self._count_width, fields, depth, key, is_root)
+            )
+            yield header
+            count = 0
+            for line in self._stream_rows(rows, items, prefix):
+                count += 1
+                yield line
+            if count >= 10**self._count_width:
+                msg = f"Streamed array of {count} rows exceeds the reserved count width"
+                raise ValueError(msg)
+            header.final = self._tabular_header(
+                f"{count:0{self._count_width}d}", fields, depth, key, is_root
+            )
+            return
+
+        # Otherwise spool the row values until the count is known. A row that
+        # breaks the tabular shape makes the array encode like the equivalent list.
+        with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_MEMORY) as spool:
+            count, rest = self._spool_rows(rows, items, spool)
+            spool.seek(0)
+            if rest is not None:
+                done = [dict(zip(fields, values, strict=True)) for values in _unspool(spool)]
+                yield from self._encode_array([*done, *rest], depth, key, is_root)
+                return
+            yield self._tabular_header(count, fields, depth, key, is_root)
+            for values in _unspool(spool):
+                yield self._format_row(values, prefix)
+
+    def _stream_rows(self, rows: _StreamedRows, items: Iterator[Any], prefix: str) -> Iterator[str]:
+        """Format the rows of a streamed tabular array, checking each against the first."""
+        keys, getter, first_values = rows
+        yield self._format_row(first_values, prefix)
+        for index, item in enumerate(items, 1):
+            values = self._row_values(item, keys, getter)
+            if values is None:
+                msg = (
+                    f"Streamed row {index} does not match the fields and primitive "
+                    "values of the first row"
+                )
+                raise ValueError(msg)
+            yield self._format_row(values, prefix)
+
+    def _spool_rows(
+        self, rows: _StreamedRows, items: Iterator[Any], spool: IO[bytes]
+    ) -> tuple[int, list[Any] | None]:
+        """Write the values of streamed rows to a spool, in blocks of rows.
+
+        Returns the number of rows spooled, and the items from the first one
+        that breaks the tabular shape (None if all of them fit).
+        """
+        keys, getter, first_values = rows
+        block = [first_values]
+        count = 1
+        rest: list[Any] | None = None
+        for item in items:
+            values = self._row_values(item, keys, getter)
+            if values is None:
+                rest = [item, *items]
+                break
+            block.append(values)
+            count += 1
+            if len(block) == _TABLE_BLOCK_ROWS:
+                pickle.dump(block, spool, pickle.HIGHEST_PROTOCOL)
+                block = []
+        pickle.dump(block, spool, pickle.HIGHEST_PROTOCOL)
+        return count, rest
+
+    def _row_values(
+        self,
+        item: Any,  # noqa: ANN401
+        keys: Collection[str],
+        getter: Callable[[Any], tuple[Any, ...]],
+    ) -> tuple[Any, ...] | None:
+        """Return the values of a streamed row, or None if it does not fit the tabular shape.
+
+        Values of unsupported types are converted with ``default`` first.
+        """
+        item, kind = self._kind_of(item)
+        if kind != "object" or item.keys() != keys:
+            return None
+        values = getter(item)
+        if not all(_is_primitive_type(type(v)) for v in values):
+            if self.config.default is None:
+                return None
+            values = tuple(self._kind_of(v)[0] for v in values)
+            if not all(_is_primitive_type(type(v)) for v in values):
+                return None
+        return values
+
+    def _format_row(self, values: tuple[Any, ...], prefix: str) -> str:
+        """Format the values of a tabular row as one line."""
+        return f"{prefix}{self.config.delimiter.join(map(self._format_cell, values))}"
+
+    def _encode_columns(
+        self, table: TabularColumns, depth: int, key: str | None, is_root: bool
+    ) -> Iterator[str]:
+        """Encode column-oriented data in tabular format, formatting whole columns."""
+        if not table.length:  # Empty table, same as an empty array
+            header = "[0]:"
+            if key:
+                header = f"{key}{header}"
+            if not is_root:
+                header = f"{self._indent(depth)}{header}"
+            yield header
+            return
+
+        delimiter = self.config.delimiter
+        fields = tuple(table.columns)
+
+        # Plain Python values, one formatter per column
+        columns: list[Sequence[Any]] = []
+        formatters = []
+        for name, column in table.columns.items():
+            values: Sequence[Any]
+            if isinstance(column, list):
+                values = column
+            elif hasattr(column, "tolist"):  # array.array, NumPy arrays
+                values = column.tolist()
+            else:
+                values = list(column)
+            column_types = tuple(set(map(type, values)))
+            if self.config.default is not None and not all(
+                _is_primitive_type(t) for t in column_types
+            ):
+                values = [self._kind_of(v)[0] for v in values]
+                column_types = tuple(set(map(type, values)))
+            if not all(_is_primitive_type(t) for t in column_types):
+                msg = f"Column {name!r} contains non-primitive values"
+                raise ValueError(msg)
+            columns.append(values)
+            formatters.append(self._column_formatter(_column_kind(column_types)))
+
+        yield self._tabular_header(table.length, fields, depth, key, is_root)
+
+        # Encode rows, formatting a block of each column at a time
+        prefix = self._indent(depth + 1 if not is_root or key else depth)
+        for start in range(0, table.length, _TABLE_BLOCK_ROWS):
+            stop = start + _TABLE_BLOCK_ROWS
+            cells = [
+                fmt(values[start:stop]) for fmt, values in zip(formatters, columns, strict=True)
+            ]
+            for row in zip(*cells, strict=True):
+                yield f"{prefix}{delimiter.join(row)}"
 
     def _encode_primitive_array(
-        self, arr: list[Any], depth: int, key: str | None, is_root: bool
-    ) -> list[str]:
+        self, arr: Sequence[Any], depth: int, key: str | None, is_root: bool
+    ) -> Iterator[str]:
         """Encode array of primitives inline."""
-        encoded_values = []
-        for v in arr:
-            # Only quote actual string values, not primitives converted to strings
-            if isinstance(v, str):
-                # Original value is a string, quote if necessary
-                if self._needs_quoting(v, self.config.delimiter):
-                    encoded_values.append(self._quote_string(v, self.config.delimiter))
-                else:
-                    encoded_values.append(v)
-            else:
-                # Original value is number/bool/null, convert to string but don't quote
-                normalized = self._normalize_value(v)
-                encoded_values.append(str(normalized))
-        content = self.config.delimiter.join(encoded_values)
+        content = self.config.delimiter.join([self._format_cell(v) for v in arr])
 
         header = f"[{len(arr)}]: {content}"
         if key:
@@ -254,172 +1147,396 @@ class ToonEncoder:
         if not is_root:
             header = f"{self._indent(depth)}{header}"
 
-        return [header]
+        yield header
+
+    def _column_formatter(self, kind: str) -> Callable[[Sequence[Any]], list[str]]:
+        """Return the formatter of a block of cells of a tabular column kind."""
+        if kind == "num":
+            return format_numbers
+        fmt = self._quoter.quote if kind == "str" else self._format_cell
+        return lambda values: list(map(fmt, values))
+
+    def _format_cell(self, value: Any) -> str:  # noqa: ANN401
+        """Format a primitive as a tabular cell or inline array item."""
+        return self._formatters[_KINDS[type(value)]](value)
 
     def _encode_nested_array(
-        self, arr: list[list[Any]], depth: int, key: str | None, is_root: bool
-    ) -> list[str]:
+        self, arr: Sequence[Sequence[Any]], depth: int, key: str | None, is_root: bool
+    ) -> Iterator[_Item]:
         """Encode array of arrays."""
-        lines: list[str] = []
-
         header = f"[{len(arr)}]:"
         if key:
             header = f"{key}{header}"
         if not is_root:
             header = f"{self._indent(depth)}{header}"
 
-        lines.append(header)
+        yield header
 
         # Encode each nested array
         item_depth = depth + 1 if not is_root or key else depth
+        if self._pool is not None and len(arr) >= _PARALLEL_MIN_ITEMS:
+            yield from self._map_chunks(_encode_items_task, arr, item_depth, True)
+            return
         for item in arr:
             # Each nested array as a list item
-            item_lines = self._encode_value(item, item_depth, key="-")
-            lines.extend(item_lines)
-
-        return lines
+            yield item, item_depth, "-"
 
     def _encode_mixed_array(
-        self, arr: list[Any], depth: int, key: str | None, is_root: bool
-    ) -> list[str]:
+        self, arr: Sequence[Any], depth: int, key: str | None, is_root: bool
+    ) -> Iterator[_Item]:
         """Encode mixed/non-uniform array."""
-        lines: list[str] = []
-
         header = f"[{len(arr)}]:"
         if key:
             header = f"{key}{header}"
         if not is_root:
             header = f"{self._indent(depth)}{header}"
 
-        lines.append(header)
+        yield header
 
         # Encode each item as list item
         item_depth = depth + 1 if not is_root or key else depth
+        if self._pool is not None and len(arr) >= _PARALLEL_MIN_ITEMS:
+            yield from self._map_chunks(_encode_items_task, arr, item_depth, False)
+            return
         for item in arr:
-            if isinstance(item, dict):
-                if not item:  # Empty object
-                    lines.append(f"{self._indent(item_depth)}-")
-                else:
-                    # First field on hyphen line, rest indented
-                    first_key = next(iter(item))
-                    first_value = item[first_key]
-
-                    # Encode first field on hyphen line
-                    if isinstance(first_value, (dict, list)):
-                        lines.append(f"{self._indent(item_depth)}- {first_key}:")
-                        child_lines = self._encode_value(first_value, item_depth + 1)
-                        lines.extend(child_lines)
-                    else:
-                        val_str = self._encode_value(first_value, 0)[0]
-                        lines.append(f"{self._indent(item_depth)}- {first_key}: {val_str}")
-
-                    # Remaining fields
-                    for k, v in list(item.items())[1:]:
-                        child_lines = self._encode_value(v, item_depth + 1, key=k)
-                        lines.extend(child_lines)
+            yield from self._encode_list_item(item, item_depth)
+
+    def _encode_list_item(self, item: Any, item_depth: int) -> Iterator[_Item]:  # noqa: ANN401
+        """Encode one ``- `` item of a mixed array."""
+        item, kind = self._kind_of(item)
+        if kind in ("object", "record"):
+            fields, values = _members(item, kind)
+            if not fields:  # Empty object
+                yield f"{self._indent(item_depth)}-"
             else:
-                # Primitive or array as list item
-                item_lines = self._encode_value(item, item_depth, key="-")
-                lines.extend(item_lines)
-
-        return lines
-
-    def _normalize_value(self, value: Any) -> Any:  # noqa: ANN401
-        """Normalize a value for encoding."""
-        if value is None:
-            return "null"
-        if isinstance(value, bool):
-            return "true" if value else "false"
-        if isinstance(value, (int, float)):
-            return self._canonicalize_number(value)
-        return value
-
-    def _canonicalize_number(self, num: int | float) -> str:
-        """Canonicalize a number per TOON spec."""
-        if isinstance(num, bool):
-            return "true" if num else "false"
-
-        if math.isnan(num) or math.isinf(num):
-            return "null"
-
-        # Convert to decimal (no exponent)
-        if isinstance(num, float):
-            if num == int(num):
-                return str(int(num))
-            # Format with sufficient precision
-            return f"{num:f}".rstrip("0").rstrip(".")
-
-        return str(num)
-
-    def _quote_string(self, s: str, delimiter: str) -> str:
-        """Quote a string if necessary."""
-        if self._needs_quoting(s, delimiter):
-            # Escape special characters
-            escaped = s.replace("\\", "\\\\").replace('"', '\\"')
-            escaped = escaped.replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
-            return f'"{escaped}"'
-        return s
-
-    def _needs_quoting(self, s: str, delimiter: str) -> bool:
-        """Check if a string needs quoting."""
-        if not s:  # Empty string
-            return True
-
-        if s != s.strip():  # Leading/trailing whitespace
-            return True
-
-        if s in ("true", "false", "null"):
-            return True
-
-        # Numeric-like
-        if re.match(r"^-?\d+(?:\.\d+)?(?:e[+-]?\d+)?$", s, re.IGNORECASE):
-            return True
-        if re.match(r"^0\d+$", s):  # Leading zeros
-            return True
-
-        # Special characters
-        if any(c in s for c in (":", '"', "\\", "[", "]", "{", "}")):
-            return True
-
-        # Control characters
-        if any(ord(c) < 32 for c in s):
-            return True
-
-        # Contains delimiter
-        if delimiter in s:
-            return True
-
-        # Starts with dash or equals dash
-        return s == "-" or s.startswith("- ")
-
-    def _is_safe_unquoted(self, value: Any, delimiter: str) -> bool:  # noqa: ANN401
-        """Check if a value can be encoded unquoted."""
-        if not isinstance(value, str):
-            return True  # Numbers, booleans, null are always safe
-        return not self._needs_quoting(value, delimiter)
+                # First field on hyphen line, rest indented
+                members = zip(fields, values, strict=True)
+                first_key, first_value = next(members)
+                first_value, first_kind = self._kind_of(first_value)
+
+                # Encode first field on hyphen line
+                if first_kind in _CONTAINER_KINDS:
+                    yield f"{self._indent(item_depth)}- {first_key}:"
+                    yield first_value, item_depth + 1, None
+                else:
+                    val_str = self._encode_scalar(first_value, 0, None)
+                    yield f"{self._indent(item_depth)}- {first_key}: {val_str}"
+
+                # Remaining fields
+                for k, v in members:
+                    yield self._child(v, item_depth + 1, k)
+        else:
+            # Primitive or array as list item
+            yield self._child(item, item_depth, "-")
+
+    def shape_cache_info(self) -> _CacheInfo:
+        """Return hit/miss statistics of the object shape cache."""
+        return self._shape_of.cache_info()
+
+    def subtree_cache_info(self) -> SubtreeCacheInfo:
+        """Return hit/miss statistics and memory use of the subtree cache."""
+        if self._subtrees is None:
+            return SubtreeCacheInfo(0, 0, 0, 0, 0)
+        return self._subtrees.info()
+
+    def clear_subtree_cache(self) -> None:
+        """Forget all cached subtrees, e.g. after mutating identity-cached objects."""
+        if self._subtrees is not None:
+            self._subtrees.clear()
+
+    def _build_shape(self, fields: tuple[str, ...]) -> _ObjectShape:
+        """Validate and render the keys of one object shape."""
+        keys = tuple(k if self._is_valid_unquoted_key(k) else self._quoter.quote(k) for k in fields)
+        header = f"{{{self.config.delimiter.join(fields)}}}"
+        foldable = len(fields) == 1 and self._is_valid_identifier(fields[0])
+        return _ObjectShape(fields, keys, header, foldable)
 
     def _is_valid_unquoted_key(self, key: str) -> bool:
         """Check if key is valid unquoted identifier."""
-        return bool(re.match(r"^[A-Za-z_][A-Za-z0-9_.]*$", key))
+        return bool(_UNQUOTED_KEY.match(key))
 
     def _is_valid_identifier(self, key: str) -> bool:
         """Check if key is valid identifier (no dots)."""
-        return bool(re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", key))
+        return bool(_IDENTIFIER.match(key))
 
     def _indent(self, depth: int) -> str:
         """Generate indentation for given depth."""
+        if depth < _INDENT_TABLE_DEPTH:
+            return self._indents[depth]
         return " " * (depth * self.config.indent_size)
 
 
-def json_to_toon(data: Any, config: ToonConfig | None = None) -> str:  # noqa: ANN401
+# Encoder of a worker process of a parallel encode
+_worker_encoder: ToonEncoder | None = None
+
+
+def _init_worker(config: ToonConfig) -> None:
+    """Create the encoder of a worker process."""
+    global _worker_encoder
+    _worker_encoder = ToonEncoder(replace(config, subtree_cache=None))
+
+
+def _encode_rows_task(rows: list[Any], shape: _ArrayShape, prefix: str) -> str:
+    """Encode a chunk of tabular rows in a worker process."""
+    assert _worker_encoder is not None
+    if _KINDS[type(rows[0])] == "record":
+        shape = replace(shape, getter=_RECORD_TYPES[type(rows[0])].values)
+    return "\n".join(_worker_encoder._tabular_rows(rows, shape, prefix))
+
+
+def _encode_items_task(items: list[Any], item_depth: int, nested: bool) -> str:
+    """Encode a chunk of list items of a nested or mixed array in a worker process."""
+    encoder = _worker_encoder
+    assert encoder is not None
+    if nested:
+        nodes: Iterator[_Item] = ((item, item_depth, "-") for item in items)
+    else:
+        nodes = chain.from_iterable(encoder._encode_list_item(item, item_depth) for item in items)
+    return "\n".join(encoder._walk(nodes))
+
+
+class _ShapeMismatchError(Exception):
+    """Raised internally when a record does not match a compiled shape."""
+
+
+# Appends the lines of one value to an output list
+_Emitter = Callable[[Any, list[str]], None]
+
+
+class CompiledEncoder:
+    """Encoder specialized for records of one fixed shape.
+
+    Key quoting, headers and per-field formatters are resolved once when the
+    encoder is compiled. Records that do not match the shape exactly (same
+    keys in the same order, same value types) are encoded by the generic path,
+    so the output is always identical to ``ToonEncoder.encode``.
+    """
+
+    def __init__(self, encoder: ToonEncoder, shape: Mapping[str, Any]) -> None:
+        """Compile ``shape`` for ``encoder``; see ``ToonEncoder.compile``."""
+        self.encoder = encoder
+        self.fields = tuple(shape)
+        self._types = tuple(_spec_type(v) for v in shape.values())
+        self._getter = _row_getter(self.fields)
+        self._emit = self._compile_object(shape, 0, None, is_root=True)
+
+        # Flat shapes of primitives get fused record and tabular row formatters
+        self._formatters: list[Callable[[Any], str]] | None = None
+        if all(_is_primitive_type(t) for t in self._types):
+            self._formatters = [self._formatter(t) for t in self._types]
+            self._prefixes = [f"{k}: " for k in encoder._shape_of(self.fields).keys]
+
+    def __call__(self, record: Any) -> str:  # noqa: ANN401
+        """Encode one record; same as ``encode``."""
+        return self.encode(record)
+
+    def encode(self, record: Any) -> str:  # noqa: ANN401
+        """Encode one record as a TOON document."""
+        if self._formatters is not None:
+            if type(record) is not dict or tuple(record) != self.fields:
+                return self.encoder.encode(record)
+            values = self._getter(record)
+            if tuple(map(type, values)) != self._types:
+                return self.encoder.encode(record)
+            return "\n".join(
+                [p + f(v) for p, f, v in zip(self._prefixes, self._formatters, values, strict=True)]
+            )
+
+        lines: list[str] = []
+        try:
+            self._emit(record, lines)
+        except _ShapeMismatchError:
+            return self.encoder.encode(record)
+        return "\n".join(lines)
+
+    def encode_array(self, records: Sequence[Any], key: str | None = None) -> str:
+        """Encode records as a tabular array, optionally nested under ``key``."""
+        encoder = self.encoder
+        data = records if key is None else {key: records}
+        if self._formatters is None or not records:
+            return encoder.encode(data)
+
+        if key is None:
+            header = encoder._tabular_header(len(records), self.fields, 0, None, is_root=True)
+            prefix = ""
+        else:
+            quoted_key = encoder._shape_of((key,)).keys[0]
+            header = encoder._tabular_header(len(records), self.fields, 0, quoted_key, False)
+            prefix = encoder._indent(1)
+
+        lines = [header]
+        append = lines.append
+        delimiter = encoder.config.delimiter
+        fields, types, getter, formatters = self.fields, self._types, self._getter, self._formatters
+        for record in records:
+            if type(record) is not dict or tuple(record) != fields:
+                return encoder.encode(data)
+            values = getter(record)
+            if tuple(map(type, values)) != types:
+                return encoder.encode(data)
+            append(prefix + delimiter.join([f(v) for f, v in zip(formatters, values, strict=True)]))
+        return "\n".join(lines)
+
+    def _formatter(self, t: type) -> Callable[[Any], str]:
+        """Resolve the formatter for primitive values of exactly type ``t``."""
+        encoder = self.encoder
+        if t is str:
+            return encoder._quoter.quote
+        if t is int:
+            return int.__repr__
+        if t is float:
+            return format_number
+        return lambda v: encoder._encode_scalar(v, 0, None)
+
+    def _compile_object(
+        self, shape: Mapping[str, Any], depth: int, parent_key: str | None, is_root: bool
+    ) -> _Emitter:
+        """Compile the emitter of an object, mirroring ``ToonEncoder._encode_object``."""
+        encoder = self.encoder
+        fields = tuple(shape)
+        getter = _row_getter(fields)
+        head = [f"{encoder._indent(depth)}{parent_key}:"] if parent_key and not is_root else []
+        if head:
+            depth += 1
+
+        if not fields:
+
+            def emit_empty(record: Any, out: list[str]) -> None:  # noqa: ANN401
+                if type(record) is not dict or record:
+                    raise _ShapeMismatchError
+                out.extend(head)
+
+            return emit_empty
+
+        object_shape = encoder._shape_of(fields)
+        single_spec = shape[fields[0]]
+        if (
+            encoder.config.key_folding == "safe"
+            and object_shape.foldable
+            and isinstance(single_spec, Mapping)
+        ):
+            return self._compile_fold(shape, depth, head)
+
+        emitters = [
+            self._compile_field(spec, depth, key)
+            for spec, key in zip(shape.values(), object_shape.keys, strict=True)
+        ]
+
+        def emit(record: Any, out: list[str]) -> None:  # noqa: ANN401
+            if type(record) is not dict or tuple(record) != fields:
+                raise _ShapeMismatchError
+            out.extend(head)
+            for field_emit, value in zip(emitters, getter(record), strict=True):
+                field_emit(value, out)
+
+        return emit
+
+    def _compile_fold(self, shape: Mapping[str, Any], depth: int, head: list[str]) -> _Emitter:
+        """Compile a chain of single-key objects folded into one dotted key."""
+        encoder = self.encoder
+        path = [next(iter(shape))]
+        spec = shape[path[0]]
+        while isinstance(spec, Mapping) and len(spec) == 1:
+            next_key = next(iter(spec))
+            if not encoder._shape_of((next_key,)).foldable:
+                break
+            path.append(next_key)
+            spec = spec[next_key]
+        child_emit = self._compile_field(spec, depth, ".".join(path))
+
+        def emit(record: Any, out: list[str]) -> None:  # noqa: ANN401
+            value = record
+            for k in path:
+                if type(value) is not dict or len(value) != 1 or k not in value:
+                    raise _ShapeMismatchError
+                value = value[k]
+            out.extend(head)
+            child_emit(value, out)
+
+        return emit
+
+    def _compile_field(self, spec: Any, depth: int, key: str) -> _Emitter:  # noqa: ANN401
+        """Compile the emitter of one ``key: value`` field."""
+        encoder = self.encoder
+        if isinstance(spec, Mapping):
+            return self._compile_object(spec, depth, key, is_root=False)
+
+        t = _spec_type(spec)
+        if not _is_primitive_type(t):
+            # Arrays and other values take the generic path
+
+            def emit_generic(value: Any, out: list[str]) -> None:  # noqa: ANN401
+                if type(value) is not t:
+                    raise _ShapeMismatchError
+                out.extend(encoder._walk(iter([encoder._child(value, depth, key)])))
+
+            return emit_generic
+
+        formatter = self._formatter(t)
+        prefix = f"{encoder._indent(depth)}{key}: "
+
+        def emit_primitive(value: Any, out: list[str]) -> None:  # noqa: ANN401
+            if type(value) is not t:
+                raise _ShapeMismatchError
+            out.append(prefix + formatter(value))
+
+        return emit_primitive
+
+
+def _spec_type(spec: Any) -> type:  # noqa: ANN401
+    """Return the type described by a shape entry: a type, a nested shape or an example value."""
+    if isinstance(spec, Mapping):
+        return dict
+    if isinstance(spec, type):
+        return spec
+    return type(spec)
+
+
+_DEFAULT_CONFIG = ToonConfig()
+
+
+@lru_cache(maxsize=_SHARED_ENCODERS)
+def _shared_encoder(config: ToonConfig) -> ToonEncoder:
+    """Return a ready encoder for a config, validated and set up only once.
+
+    Encoders keep no per-call state on themselves, so one instance can serve
+    any number of calls, including concurrent ones.
+    """
+    return ToonEncoder(config)
+
+
+def json_to_toon(
+    data: Any,  # noqa: ANN401
+    config: ToonConfig | None = None,
+    workers: int | None = None,
+) -> str:
     """Convert JSON data to TOON format string.
 
     Args:
         data: Python object to encode (dict, list, or primitive)
         config: Optional encoding configuration
+        workers: Optional number of processes to encode large arrays in
 
     Returns:
         TOON format string
     """
-    encoder = ToonEncoder(config)
-    return encoder.encode(data)
+    encoder = _shared_encoder(config or _DEFAULT_CONFIG)
+    return encoder.encode(data, workers)
+
+
+def json_to_toon_stream(
+    data: Any,  # noqa: ANN401
+    fp: IO[str],
+    config: ToonConfig | None = None,
+    workers: int | None = None,
+) -> None:
+    """Convert JSON data to TOON and write it incrementally to a file-like object.
+
+    Args:
+        data: Python object to encode (dict, list, or primitive)
+        fp: Writable text file-like object (ideally buffered)
+        config: Optional encoding configuration
+        workers: Optional number of processes to encode large arrays in
+    """
+    encoder = _shared_encoder(config or _DEFAULT_CONFIG)
+    encoder.dump(data, fp, workers)
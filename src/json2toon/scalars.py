@@ -0,0 +1,164 @@
+"""Scalar quoting, escaping and number formatting shared by the TOON encoder and decoder."""
+
+from __future__ import annotations
+
+import re
+from decimal import Decimal
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from functools import _CacheInfo
+
+__all__ = ["StringQuoter", "escape_string", "format_number", "format_numbers", "unescape_string"]
+
+# Escape sequences understood inside quoted TOON strings
+ESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+_ESCAPE_TABLE = str.maketrans(ESCAPES)
+
+# The same table read backwards: the character after a backslash, unescaped
+_UNESCAPES = {escaped[1]: char for char, escaped in ESCAPES.items()}
+
+_ESCAPE_SEQUENCE = re.compile(r"\\([" + re.escape("".join(_UNESCAPES)) + "])")
+
+_RESERVED_WORDS = frozenset(("true", "false", "null"))
+
+_NUMERIC_LIKE = re.compile(r"^-?\d+(?:\.\d+)?(?:e[+-]?\d+)?$", re.IGNORECASE)
+
+# One character class per delimiter: structural characters, control characters
+# and the active delimiter all force quoting
+_SPECIAL_CHARS = {
+    delimiter: re.compile("[" + re.escape(':"\\[]{}' + delimiter) + "\\x00-\\x1f]")
+    for delimiter in (",", "\t", "|")
+}
+
+# Strings longer than this are rare repeats, so they bypass the quoting decision
+# cache here and the decoder's token cache
+_MAX_CACHED_LENGTH = 64
+
+# Float reprs of values TOON has no number for
+_NON_FINITE = frozenset(("inf", "-inf", "nan"))
+
+
+def escape_string(s: str) -> str:
+    """Escape backslashes, quotes and line/tab control characters in one pass."""
+    return s.translate(_ESCAPE_TABLE)
+
+
+def unescape_string(s: str) -> str:
+    """Undo ``escape_string`` in one pass; other backslashes are kept as they are."""
+    if "\\" not in s:
+        return s
+    return _ESCAPE_SEQUENCE.sub(_unescape_match, s)
+
+
+def _unescape_match(match: re.Match[str]) -> str:
+    """Return the character an escape sequence stands for."""
+    return _UNESCAPES[match.group(1)]
+
+
+def _canonical_float(text: str) -> str:
+    """Turn the shortest round-trip repr of a float into canonical TOON form.
+
+    Integral values lose their ``.0``, exponents are expanded to plain decimal
+    notation and non-finite values become ``null``.
+    """
+    if text.endswith(".0"):
+        return "0" if text == "-0.0" else text[:-2]
+    if "e" in text:
+        return format(Decimal(text), "f")
+    if text in _NON_FINITE:
+        return "null"
+    return text
+
+
+def format_number(num: Any) -> str:  # noqa: ANN401
+    """Format a number canonically: no exponent, no trailing zeros, exact round trip.
+
+    Floats use their shortest repr (the fewest digits that parse back to the
+    same value), so ``1e-09`` is written as ``0.000000001`` and
+    ``1.23456789`` keeps all of its digits. NaN and infinities become ``null``.
+    """
+    if isinstance(num, bool):
+        return "true" if num else "false"
+    if isinstance(num, float):
+        return _canonical_float(float.__repr__(num))
+    return int.__repr__(num)
+
+
+def format_numbers(values: Iterable[Any]) -> list[str]:
+    """Format a column of numbers, classifying the column once instead of per value.
+
+    Args:
+        values: A list, ``array.array``, NumPy array or other iterable of numbers
+
+    Returns:
+        The canonical text of each value, as ``format_number`` would produce it
+    """
+    if hasattr(values, "tolist"):  # array.array, NumPy arrays
+        values = values.tolist()
+    elif not isinstance(values, list | tuple):
+        values = list(values)
+
+    types = set(map(type, values))
+    if types == {int}:
+        return list(map(int.__repr__, values))
+    if types == {float}:
+        return list(map(_canonical_float, map(float.__repr__, values)))
+    return list(map(format_number, values))
+
+
+class StringQuoter:
+    """Quotes string values for one delimiter, caching decisions for short strings.
+
+    Tabular data is dominated by low-cardinality string columns (status codes,
+    country codes, enum values), so the rendered form of short strings is kept
+    in a bounded LRU cache.
+    """
+
+    def __init__(self, delimiter: str, cache_size: int = 4096) -> None:
+        """Initialize the quoter for a delimiter with a decision cache size."""
+        self.delimiter = delimiter
+        self._special = _SPECIAL_CHARS[delimiter].search
+        self._cached_quote = lru_cache(maxsize=cache_size)(self._quote)
+
+    def quote(self, s: str) -> str:
+        """Return ``s`` as it must appear in TOON output, quoted only if necessary."""
+        if len(s) <= _MAX_CACHED_LENGTH:
+            return self._cached_quote(s)
+        return self._quote(s)
+
+    def needs_quoting(self, s: str) -> bool:
+        """Check if a string needs quoting."""
+        if not s:  # Empty string
+            return True
+
+        # Leading/trailing whitespace (same test as ``s != s.strip()``)
+        if s[0].isspace() or s[-1].isspace():
+            return True
+
+        if s in _RESERVED_WORDS:
+            return True
+
+        # Structural/control characters or the active delimiter
+        if self._special(s):
+            return True
+
+        # Numeric-like (also covers leading zeros)
+        if _NUMERIC_LIKE.match(s):
+            return True
+
+        # Starts with dash or equals dash
+        return s == "-" or s.startswith("- ")
+
+    def cache_info(self) -> _CacheInfo:
+        """Return hit/miss statistics of the decision cache."""
+        return self._cached_quote.cache_info()
+
+    def _quote(self, s: str) -> str:
+        """Quote and escape a string if it needs quoting."""
+        if self.needs_quoting(s):
+            return f'"{s.translate(_ESCAPE_TABLE)}"'
+        return s
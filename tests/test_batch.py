@@ -0,0 +1,95 @@
+"""Tests for batch encoding and decoding."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from json2toon import (
+    ToonConfig,
+    ToonParseConfig,
+    ToonParseError,
+    decode_many,
+    encode_many,
+    json_to_toon,
+    toon_to_json,
+)
+
+DOCUMENTS = [
+    {"id": i, "name": f"user{i}", "tags": ["a", "b"][: i % 3], "items": [{"x": i, "y": "z"}]}
+    for i in range(300)
+]
+
+
+class TestEncodeMany:
+    """Test encoding many documents."""
+
+    def test_matches_per_call(self) -> None:
+        """Test serial batch output matches json_to_toon per document."""
+        config = ToonConfig(delimiter="|")
+        expected = [json_to_toon(doc, config) for doc in DOCUMENTS]
+        assert list(encode_many(DOCUMENTS, config)) == expected
+        assert list(encode_many(iter(DOCUMENTS), config, workers=1)) == expected
+
+    def test_thread_pool_ordered(self) -> None:
+        """Test a thread pool keeps input order across chunks."""
+        expected = [json_to_toon(doc) for doc in DOCUMENTS]
+        assert list(encode_many(DOCUMENTS, workers=3)) == expected
+
+    def test_unordered(self) -> None:
+        """Test unordered delivery produces every result once."""
+        expected = [json_to_toon(doc) for doc in DOCUMENTS]
+        results = list(encode_many(iter(DOCUMENTS), workers=3, ordered=False))
+        assert sorted(results) == sorted(expected)
+
+    def test_process_pool(self) -> None:
+        """Test a process pool matches serial output."""
+        docs = DOCUMENTS[:100]
+        expected = [json_to_toon(doc) for doc in docs]
+        assert list(encode_many(docs, workers=2, pool="process")) == expected
+
+    def test_input_read_lazily(self) -> None:
+        """Test only a bounded number of documents is read ahead of the consumer."""
+        read = 0
+
+        def documents() -> Iterator[dict[str, Any]]:
+            nonlocal read
+            for doc in DOCUMENTS * 10:
+                read += 1
+                yield doc
+
+        results = encode_many(documents(), workers=2)
+        next(results)
+        assert read < len(DOCUMENTS) * 10
+
+    def test_invalid_arguments(self) -> None:
+        """Test bad worker counts and pool kinds are rejected up front."""
+        with pytest.raises(ValueError, match="Invalid workers"):
+            encode_many([], workers=0)
+        with pytest.raises(ValueError, match="Invalid pool"):
+            encode_many([], workers=2, pool="fiber")
+
+
+class TestDecodeMany:
+    """Test decoding many documents."""
+
+    def test_round_trip(self) -> None:
+        """Test serial and pooled decoding restore the documents in order."""
+        texts = [json_to_toon(doc) for doc in DOCUMENTS]
+        assert list(decode_many(texts)) == DOCUMENTS
+        assert list(decode_many(texts, workers=3)) == DOCUMENTS
+
+    def test_config_applied(self) -> None:
+        """Test the parsing config is used for every document."""
+        config = ToonParseConfig(expand_paths="safe")
+        results = decode_many(["a.b: 1", "c.d: 2"], config, workers=2, ordered=False)
+        assert sorted(results, key=str) == [{"a": {"b": 1}}, {"c": {"d": 2}}]
+        assert toon_to_json("a.b: 1") == {"a.b": 1}
+
+    def test_error_raised_at_document(self) -> None:
+        """Test a malformed document raises when its result is reached."""
+        results = decode_many(["a: 1", "items[3]: 1,2"], workers=2)
+        with pytest.raises(ToonParseError):
+            list(results)
@@ -0,0 +1,56 @@
+"""Tests for the subtree cache."""
+
+from __future__ import annotations
+
+import sys
+
+from json2toon.cache import SubtreeCache
+
+
+class TestSubtreeCache:
+    """Test LRU eviction and counters."""
+
+    def test_hits_and_misses(self) -> None:
+        """Test lookups are counted."""
+        cache = SubtreeCache(1 << 20)
+        assert cache.get("a") is None
+        cache.put("a", "text")
+        assert cache.get("a") == "text"
+        info = cache.info()
+        assert (info.hits, info.misses, info.entries) == (1, 1, 1)
+        assert info.size == sys.getsizeof("text")
+
+    def test_reference_must_match(self) -> None:
+        """Test entries stored for an object only match that object."""
+        cache = SubtreeCache(1 << 20)
+        owner = {"a": 1}
+        cache.put("k", "text", owner)
+        assert cache.get("k", owner) == "text"
+        assert cache.get("k", {"a": 1}) is None
+
+    def test_byte_budget_evicts_least_recently_used(self) -> None:
+        """Test the oldest entries are evicted once the budget is exceeded."""
+        entry = sys.getsizeof("x" * 100)
+        cache = SubtreeCache(entry * 2)
+        cache.put("a", "a" * 100)
+        cache.put("b", "b" * 100)
+        cache.get("a")
+        cache.put("c", "c" * 100)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.info().size == entry * 2
+
+    def test_oversized_entries_are_skipped(self) -> None:
+        """Test text larger than the whole budget is not cached."""
+        cache = SubtreeCache(10)
+        cache.put("a", "a" * 100)
+        assert cache.info().entries == 0
+
+    def test_clear(self) -> None:
+        """Test clearing keeps counters but drops entries."""
+        cache = SubtreeCache(1 << 20)
+        cache.put("a", "text")
+        cache.get("a")
+        cache.clear()
+        assert cache.get("a") is None
+        assert cache.info()[:4] == (1, 1, 0, 0)
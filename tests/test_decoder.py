@@ -2,9 +2,24 @@
 
 from __future__ import annotations
 
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import pytest
 
-from json2toon import ToonParseConfig, ToonParseError, toon_to_json
+from json2toon import (
+    IncrementalToonDecoder,
+    LazyArray,
+    LazyObject,
+    ToonDecoder,
+    ToonParseConfig,
+    ToonParseError,
+    iter_rows,
+    toon_to_json,
+)
 
 
 class TestBasicDecoding:
@@ -118,6 +133,10 @@ class TestStringUnquoting:
         result = toon_to_json(toon)
         assert result["val"] == 'He said "hello"'
 
+    def test_escaped_backslash_before_n(self) -> None:
+        """Test an escaped backslash followed by n decodes to a backslash and n."""
+        assert toon_to_json(r'path: "C:\\new"') == {"path": "C:\\new"}
+
 
 class TestDelimiters:
     """Test different delimiters."""
@@ -142,6 +161,19 @@ class TestDelimiters:
         assert len(result["items"]) == 2
         assert result["items"][0]["name"] == "Alice"
 
+    def test_quoted_cells(self) -> None:
+        """Test delimiters, colons and escaped quotes inside quoted cells."""
+        toon = 'rows[2]{a,b}:\n  "x,y","k: v"\n  "say \\"hi\\", ok",2\nnext: 1'
+        assert toon_to_json(toon) == {
+            "rows": [{"a": "x,y", "b": "k: v"}, {"a": 'say "hi", ok', "b": 2}],
+            "next": 1,
+        }
+
+    def test_row_ends_at_key_value_line(self) -> None:
+        """Test a line with a colon before any delimiter ends the rows."""
+        toon = 'rows[1|]{a|b}:\n  1|x:y\n"k|": 2'
+        assert toon_to_json(toon) == {"rows": [{"a": 1, "b": "x:y"}], "k|": 2}
+
 
 class TestRootTypes:
     """Test different root types."""
@@ -185,6 +217,20 @@ class TestStrictMode:
         # Should decode without error
         assert "items" in result
 
+    def test_indentation_validated_everywhere(self) -> None:
+        """Test bad indentation is rejected even on lines the parser skips."""
+        with pytest.raises(ToonParseError, match="multiple of 2"):
+            toon_to_json("a: 1\n   x: 2")
+        assert toon_to_json("a: 1\n   x: 2", ToonParseConfig(strict=False)) == {"a": 1}
+
+    def test_blank_line_indentation_ignored(self) -> None:
+        """Test whitespace-only lines are not checked for indentation."""
+        assert toon_to_json("a:\n  b: 1\n   \nc: 2", ToonParseConfig(strict=False)) == {
+            "a": {"b": 1},
+            "c": 2,
+        }
+        assert toon_to_json("a: 1\n   \nb: 2") == {"a": 1, "b": 2}
+
 
 class TestPathExpansion:
     """Test path expansion."""
@@ -229,3 +275,328 @@ class TestEdgeCases:
         assert result["int"] == 42
         assert result["float"] == 3.14
         assert result["exp"] == 1e10
+
+
+class TestLineLexer:
+    """Test how lines are split into keys, headers and values."""
+
+    def test_quoted_header_key(self) -> None:
+        """Test a quoted array key is unquoted like any other key."""
+        assert toon_to_json('"my key"[2]: 1,2') == {"my key": [1, 2]}
+
+    def test_brackets_inside_quotes(self) -> None:
+        """Test brackets inside quoted keys and values do not start a header."""
+        assert toon_to_json('"a[1]": 2\nb: "[3]: x"') == {"a[1]": 2, "b": "[3]: x"}
+        assert toon_to_json('"404": "error [1]: not found"') == {"404": "error [1]: not found"}
+        assert toon_to_json('"a:b": "see [2]: z"') == {"a:b": "see [2]: z"}
+
+    def test_backslashes_before_bracket_are_linear(self) -> None:
+        """Test runs of backslash pairs before a bracket do not backtrack exponentially."""
+        start = time.perf_counter()
+        assert toon_to_json("note: ok\n" + "\\a" * 5000 + "[1]") == {"note": "ok"}
+        assert toon_to_json("[" + "\\a" * 5000) == "[" + "\\a" * 5000
+        assert time.perf_counter() - start < 1
+
+    def test_list_item_with_quoted_colon(self) -> None:
+        """Test a list item whose only colon is quoted is a primitive."""
+        assert toon_to_json('items[2]:\n  - "a: b"\n  - x') == {"items": ["a: b", "x"]}
+
+
+class TestPrimitiveParsing:
+    """Test typing of primitive tokens and the token cache."""
+
+    @pytest.mark.parametrize("token_cache_size", [4096, 0])
+    def test_token_types(self, token_cache_size: int) -> None:
+        """Test numbers, literals and strings are typed alike with and without the cache."""
+        config = ToonParseConfig(token_cache_size=token_cache_size)
+        toon = "v[12]: 42,-7,3.5,.5,1e3,007,1_000,+1,2024-01-01,nan,null,-"
+        assert toon_to_json(toon, config)["v"] == [
+            42, -7, 3.5, 0.5, 1000.0, 7, 1000, 1, "2024-01-01", "nan", None, "-"
+        ]  # fmt: skip
+
+    def test_cached_strings_are_interned(self) -> None:
+        """Test repeated string cells share one interned object."""
+        result = toon_to_json("rows[2]{s}:\n  active\n  active")
+        first, second = (row["s"] for row in result["rows"])
+        assert first is second is sys.intern("active")
+
+    def test_invalid_token_cache_size(self) -> None:
+        """Test a negative token cache size is rejected."""
+        with pytest.raises(ValueError, match="Invalid token_cache_size"):
+            ToonDecoder(ToonParseConfig(token_cache_size=-1))
+
+
+class TestSharedDecoders:
+    """Test the decoders cached behind toon_to_json."""
+
+    def test_concurrent_calls(self) -> None:
+        """Test toon_to_json can be called from many threads at once."""
+        docs = [f"id: {i}\nitems[2]: {i},x" for i in range(200)]
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(toon_to_json, docs))
+        assert results == [{"id": i, "items": [i, "x"]} for i in range(200)]
+
+    def test_decoder_reused_per_config(self) -> None:
+        """Test equal configs share one cached decoder."""
+        from json2toon.decoder import _shared_decoder
+
+        config = ToonParseConfig(expand_paths="safe")
+        assert _shared_decoder(config) is _shared_decoder(ToonParseConfig(expand_paths="safe"))
+        assert toon_to_json("a.b: 1", config) == {"a": {"b": 1}}
+
+    def test_document_released(self) -> None:
+        """Test the cached decoder keeps no reference to the last document."""
+        from json2toon.decoder import _shared_decoder
+
+        toon = "rows[2]{a,b}:\n  1,x\n  2,y\nname: " + "z" * 1000
+        before = sys.getrefcount(toon)
+        toon_to_json(toon)
+        decoder = _shared_decoder(ToonParseConfig())
+        assert sys.getrefcount(toon) == before
+        assert decoder.text == ""
+        assert not decoder.tokens
+        assert decoder.line_count == len(decoder.starts) == 0
+        with pytest.raises(ToonParseError):
+            toon_to_json(toon + "\nbad[3]: 1")
+        assert decoder.text == ""
+
+
+class TestIterparse:
+    """Test the pull parser event stream."""
+
+    def test_events(self) -> None:
+        """Test objects, arrays, rows and values produce their events in order."""
+        toon = (
+            "id: 7\nmeta:\n  tags[2]: a,b\nrows[2]{x,y}:\n  1,p\n  2,q\nitems[2]:\n  - k: 1\n  - z"
+        )
+        assert list(ToonDecoder().iterparse(toon)) == [
+            ("start_object", None),
+            ("key", "id"),
+            ("value", 7),
+            ("key", "meta"),
+            ("start_object", None),
+            ("key", "tags"),
+            ("start_array", (2, None)),
+            ("value", "a"),
+            ("value", "b"),
+            ("end_array", None),
+            ("end_object", None),
+            ("key", "rows"),
+            ("start_array", (2, ["x", "y"])),
+            ("row", (1, "p")),
+            ("row", (2, "q")),
+            ("end_array", None),
+            ("key", "items"),
+            ("start_array", (2, None)),
+            ("start_object", None),
+            ("key", "k"),
+            ("value", 1),
+            ("end_object", None),
+            ("value", "z"),
+            ("end_array", None),
+            ("end_object", None),
+        ]
+
+    def test_root_primitive_and_empty(self) -> None:
+        """Test a primitive document is one value and an empty one an empty object."""
+        decoder = ToonDecoder()
+        assert list(decoder.iterparse("hello")) == [("value", "hello")]
+        assert list(decoder.iterparse("")) == [("start_object", None), ("end_object", None)]
+
+    def test_reads_lines_lazily(self) -> None:
+        """Test lines are read only as far as the events consumed."""
+        read = 0
+
+        def lines() -> Iterator[str]:
+            nonlocal read
+            yield "rows[100000]{a,b}:\n"
+            for i in range(100_000):
+                read += 1
+                yield f"  {i},x\n"
+
+        events = ToonDecoder().iterparse(lines())
+        assert [next(events) for _ in range(5)][-1] == ("row", (1, "x"))
+        assert read <= 3
+
+    def test_file_source(self, tmp_path: Path) -> None:
+        """Test a file is read line by line, ignoring its final newline."""
+        path = tmp_path / "doc.toon"
+        path.write_text("rows[1]{a}:\n  1\n", encoding="utf-8")
+        with path.open(encoding="utf-8") as fp:
+            events = list(ToonDecoder().iterparse(fp))
+        assert ("row", (1,)) in events
+
+    def test_strict_errors(self) -> None:
+        """Test strict mode checks are raised while iterating."""
+        events = ToonDecoder().iterparse("items[3]: 1,2\nrows[2]{a}:\n  1")
+        assert next(events) == ("start_object", None)
+        with pytest.raises(ToonParseError, match="count mismatch"):
+            list(events)
+        nonstrict = ToonDecoder(ToonParseConfig(strict=False))
+        assert ("row", (1,)) in list(nonstrict.iterparse("rows[2]{a}:\n  1"))
+
+
+class TestIterRows:
+    """Test streaming the rows of one tabular array."""
+
+    TOON = "meta:\n  items[1]{a,b}:\n    9,z\nitems[2]{a,b}:\n  1,x\n  2,y\ntail: 1"
+
+    def test_rows(self) -> None:
+        """Test rows are found by key path and produced as dicts or tuples."""
+        assert list(iter_rows(self.TOON, "items")) == [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}]
+        assert list(iter_rows(self.TOON, "meta.items", as_tuples=True)) == [(9, "z")]
+        assert list(iter_rows("data.items[1]{a}:\n  5", "data.items")) == [{"a": 5}]
+
+    def test_stops_after_declared_count(self) -> None:
+        """Test no line past the array is read, except one in strict mode."""
+        read = 0
+
+        def lines() -> Iterator[str]:
+            nonlocal read
+            for line in ["items[2]{a}:", "  1", "  2", "next: 1", "more: 2"]:
+                read += 1
+                yield line
+
+        assert len(list(iter_rows(lines(), "items", ToonParseConfig(strict=False)))) == 2
+        assert read == 3
+        read = 0
+        assert len(list(iter_rows(lines(), "items"))) == 2
+        assert read == 4
+
+    def test_strict_checks(self) -> None:
+        """Test width and count mismatches are raised in strict mode only."""
+        with pytest.raises(ToonParseError, match="expected 2, got 3"):
+            list(iter_rows("items[2]{a}:\n  1\n  2\n  3", "items"))
+        with pytest.raises(ToonParseError, match="Row width mismatch"):
+            list(iter_rows("items[1]{a,b}:\n  1", "items"))
+        config = ToonParseConfig(strict=False)
+        assert list(iter_rows("items[2]{a}:\n  1\n  2\n  3", "items", config)) == [
+            {"a": 1},
+            {"a": 2},
+        ]
+
+    def test_missing_array(self) -> None:
+        """Test a path without a tabular array is an error."""
+        with pytest.raises(ToonParseError, match="No tabular array at path: tags"):
+            list(iter_rows("tags[2]: a,b", "tags"))
+
+
+class TestIncrementalToonDecoder:
+    """Test decoding TOON fed in chunks."""
+
+    TOON = "id: 7\nrows[2]{a,b}:\n  1,x\n  2,y\nitems[2]:\n  - k: 1\n  - z\nmeta:\n  ok: true"
+
+    def test_matches_decode(self) -> None:
+        """Test feeding one character at a time decodes like toon_to_json."""
+        decoder = IncrementalToonDecoder()
+        for char in self.TOON:
+            decoder.feed(char)
+        completed = decoder.close()
+        assert decoder.result == toon_to_json(self.TOON)
+        assert completed[-1] == ((), decoder.result)
+
+    def test_values_emitted_when_lines_end(self) -> None:
+        """Test rows and list items are reported as soon as their line is complete."""
+        decoder = IncrementalToonDecoder()
+        assert decoder.feed("id: 7\nrows[2]{a,b}:\n  1,") == [(("id",), 7)]
+        assert decoder.feed("x\n  2,y") == [(("rows", 0), {"a": 1, "b": "x"})]
+        assert decoder.feed("\nitems[2]:\n  - k: 1\n  - z\n") == [
+            (("rows", 1), {"a": 2, "b": "y"}),
+            (("rows",), [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}]),
+            (("items", 0, "k"), 1),
+            (("items", 0), {"k": 1}),
+            (("items", 1), "z"),
+        ]
+        assert decoder.close() == [
+            (("items",), [{"k": 1}, "z"]),
+            ((), decoder.result),
+        ]
+
+    def test_expand_paths_matches_decode(self) -> None:
+        """Test dotted keys are expanded where toon_to_json expands them, and only there."""
+        config = ToonParseConfig(expand_paths="safe")
+        toon = "a.b: 1\nitems[2]:\n  - c.d: 2\n    e.f: 3\n    g:\n      h.i: 4\n  -\n    j.k: 5"
+        decoder = IncrementalToonDecoder(config)
+        for char in toon:
+            decoder.feed(char)
+        decoder.close()
+        assert decoder.result == toon_to_json(toon, config)
+        assert decoder.result["items"][0] == {"c.d": 2, "e.f": 3, "g": {"h": {"i": 4}}}
+        assert decoder.result["items"][1] == {"j": {"k": 5}}
+
+    def test_strict_errors(self) -> None:
+        """Test strict mode errors are raised by the call that completes the line."""
+        decoder = IncrementalToonDecoder()
+        decoder.feed("rows[1]{a,b}:\n  1")
+        with pytest.raises(ToonParseError, match="Row width mismatch"):
+            decoder.feed("\n")
+
+    def test_closed(self) -> None:
+        """Test a closed decoder cannot be fed again."""
+        decoder = IncrementalToonDecoder(ToonParseConfig(expand_paths="safe"))
+        decoder.feed("a.b: 1")
+        decoder.close()
+        assert decoder.result == {"a": {"b": 1}}
+        with pytest.raises(ValueError, match="closed"):
+            decoder.feed("c: 2")
+
+
+class TestLazyDecoding:
+    """Test decoding fields only when they are accessed."""
+
+    TOON = (
+        "id: 7\nmeta:\n  name: cat\n  tags[2]: a,b\n  deep:\n    x: 1\n"
+        "rows[2]{a,b}:\n  1,x\n  2,y\nitems:\n  - 1\n  - 2\nempty:\nid: 8"
+    )
+    LAZY = ToonParseConfig(lazy=True)
+
+    def test_matches_decode(self) -> None:
+        """Test a lazily decoded document equals the eagerly decoded one."""
+        doc = toon_to_json(self.TOON, self.LAZY)
+        assert isinstance(doc, LazyObject)
+        assert doc == toon_to_json(self.TOON)
+        assert list(doc) == ["id", "meta", "rows", "items", "empty"]
+        assert doc["id"] == 8  # A repeated key keeps its place and takes its last value
+
+    def test_proxies(self) -> None:
+        """Test nested objects and arrays with items below are returned as proxies."""
+        doc = toon_to_json(self.TOON, self.LAZY)
+        assert isinstance(doc["meta"], LazyObject)
+        assert isinstance(doc["meta"]["deep"], LazyObject)
+        assert doc["meta"]["tags"] == ["a", "b"]  # Inline arrays are decoded at once
+        rows = doc["rows"]
+        assert isinstance(rows, LazyArray)
+        assert repr(rows) == "LazyArray(...)"
+        assert rows[1] == {"a": 2, "b": "y"}
+        assert len(doc["items"]) == 2
+        assert doc["empty"] is None
+        assert doc["meta"] is doc["meta"]
+
+    def test_errors_raised_on_access(self) -> None:
+        """Test errors in a field are raised when the field is accessed."""
+        doc = toon_to_json("ok: 1\nbad[3]: 1,2\n", self.LAZY)
+        assert doc["ok"] == 1
+        with pytest.raises(ToonParseError, match="Array count mismatch"):
+            list(doc["bad"])
+        with pytest.raises(ToonParseError, match="Indentation"):
+            toon_to_json("a: 1\n   b: 2", self.LAZY)
+
+    def test_repeated_key_is_checked(self) -> None:
+        """Test errors in the shadowed value of a repeated key are still raised."""
+        doc = toon_to_json("a:\n  b[2]: 1\nc: 3\na: 2", self.LAZY)
+        with pytest.raises(ToonParseError, match="Array count mismatch"):
+            doc["c"]
+
+    def test_roots(self) -> None:
+        """Test root arrays are lazy and other roots are decoded at once."""
+        root = toon_to_json("[2]:\n- 1\n- 2", self.LAZY)
+        assert isinstance(root, LazyArray)
+        assert root == [1, 2]
+        assert toon_to_json("hello", self.LAZY) == "hello"
+        assert toon_to_json("", self.LAZY) == {}
+
+    def test_path_expansion(self) -> None:
+        """Test an object with dotted keys is expanded as a whole."""
+        config = ToonParseConfig(lazy=True, expand_paths="safe")
+        doc = toon_to_json("a.b: 1\na.c: 2\nd:\n  e.f: 3", config)
+        assert doc == {"a": {"b": 1, "c": 2}, "d": {"e": {"f": 3}}}
@@ -2,9 +2,28 @@
 
 from __future__ import annotations
 
+import dataclasses
+import datetime
+import io
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+from fractions import Fraction
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, NamedTuple
+from uuid import UUID
+
 import pytest
 
-from json2toon import ToonConfig, json_to_toon
+from json2toon import (
+    TabularColumns,
+    ToonConfig,
+    ToonEncoder,
+    json_to_toon,
+    json_to_toon_stream,
+    toon_to_json,
+)
 
 
 class TestBasicEncoding:
@@ -95,6 +114,23 @@ class TestArrayEncoding:
         result = json_to_toon(data)
         assert "pairs[2]:" in result
 
+    def test_tabular_rows_follow_first_key_order(self) -> None:
+        """Test rows with reordered keys are emitted in header order."""
+        data = {"rows": [{"id": 1, "name": "Ada"}, {"name": "Bob", "id": 2}]}
+        result = json_to_toon(data)
+        assert result == "rows[2]{id,name}:\n  1,Ada\n  2,Bob"
+
+    def test_tabular_mixed_column_types(self) -> None:
+        """Test columns mixing numbers, strings, booleans and null."""
+        data = {"rows": [{"v": 1}, {"v": "1"}, {"v": True}, {"v": None}, {"v": 2.5}]}
+        result = json_to_toon(data)
+        assert result == 'rows[5]{v}:\n  1\n  "1"\n  true\n  null\n  2.5'
+
+    def test_non_uniform_objects_not_tabular(self) -> None:
+        """Test objects with differing keys or nested values are not tabular."""
+        assert "{" not in json_to_toon({"rows": [{"a": 1}, {"b": 2}]})
+        assert "{" not in json_to_toon({"rows": [{"a": 1}, {"a": [1]}]})
+
 
 class TestStringQuoting:
     """Test string quoting logic."""
@@ -164,6 +200,33 @@ class TestConfiguration:
         assert "a.b.c: 1" in result
 
 
+class TestSharedEncoders:
+    """Test immutable configs and the encoders cached behind json_to_toon."""
+
+    def test_config_is_frozen_and_hashable(self) -> None:
+        """Test configs cannot be modified and compare by value."""
+        config = ToonConfig(delimiter="|")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.delimiter = ","  # type: ignore[misc]
+        assert hash(config) == hash(ToonConfig(delimiter="|"))
+        assert not hasattr(config, "__dict__")
+        assert dataclasses.replace(config, indent_size=4).indent_size == 4
+
+    def test_encoder_reused_per_config(self) -> None:
+        """Test equal configs share one ready encoder."""
+        from json2toon.encoder import _shared_encoder
+
+        config = ToonConfig(indent_size=3)
+        assert _shared_encoder(config) is _shared_encoder(ToonConfig(indent_size=3))
+        assert json_to_toon({"a": {"b": 1}}, config) == "a:\n   b: 1"
+
+    def test_invalid_config_not_cached(self) -> None:
+        """Test invalid configs are rejected on every call."""
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Invalid delimiter"):
+                json_to_toon({}, ToonConfig(delimiter=";"))
+
+
 class TestNumberCanonicalization:
     """Test number canonicalization."""
 
@@ -191,6 +254,19 @@ class TestNumberCanonicalization:
         result = json_to_toon(data)
         assert "val: null" in result
 
+    def test_float_precision(self) -> None:
+        """Test small and long floats keep every significant digit."""
+        data = {"small": 1e-9, "long": 1.23456789, "rows": [{"x": 1e-9}, {"x": 0.1 + 0.2}]}
+        result = json_to_toon(data)
+        assert result.splitlines() == [
+            "small: 0.000000001",
+            "long: 1.23456789",
+            "rows[2]{x}:",
+            "  0.000000001",
+            "  0.30000000000000004",
+        ]
+        assert toon_to_json(result) == data
+
 
 class TestRootTypes:
     """Test different root types."""
@@ -238,3 +314,552 @@ class TestEdgeCases:
         result = json_to_toon(data)
         assert "José" in result
         assert "🎉" in result
+
+
+class TestStreamingEncoding:
+    """Test incremental encoding APIs."""
+
+    def test_iterencode_matches_encode(self) -> None:
+        """Test joined chunks equal the encoded string."""
+        data = {
+            "users": [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}],
+            "meta": {"tags": ["a", "b"], "nested": [[1, 2], [3]]},
+        }
+        encoder = ToonEncoder()
+        assert "".join(encoder.iterencode(data)) == encoder.encode(data)
+
+    def test_iterencode_is_lazy(self) -> None:
+        """Test the first chunk is available before the tree is fully walked."""
+        data = {"a": 1, "b": {"c": 2}}
+        chunks = ToonEncoder().iterencode(data)
+        assert next(chunks) == "a: 1"
+
+    def test_iterencode_empty(self) -> None:
+        """Test empty document yields no chunks."""
+        assert list(ToonEncoder().iterencode({})) == []
+
+    def test_stream_to_file(self) -> None:
+        """Test writing directly into a file-like object."""
+        data = {"items": [{"id": 1, "name": "Ada"}]}
+        config = ToonConfig(delimiter="|")
+        buf = io.StringIO()
+        json_to_toon_stream(data, buf, config)
+        assert buf.getvalue() == json_to_toon(data, config)
+
+
+class TestShapeCache:
+    """Test the per-encoder object shape cache."""
+
+    def test_repeated_shapes_hit_cache(self) -> None:
+        """Test objects sharing a key tuple reuse one cache entry."""
+        encoder = ToonEncoder()
+        data = {"a": {"x": 1, "y": 2}, "b": {"x": 3, "y": 4}, "c": {"x": 5, "y": 6}}
+        encoder.encode(data)
+        info = encoder.shape_cache_info()
+        assert info.misses == 2  # root shape and {x, y}
+        assert info.hits == 2
+
+    def test_quoted_keys_cached(self) -> None:
+        """Test quoted keys render the same from the cache."""
+        encoder = ToonEncoder()
+        data = {"a": {"a:b": 1, "ok": 2}, "b": {"a:b": 3, "ok": 4}}
+        first = encoder.encode(data)
+        assert first == 'a:\n  "a:b": 1\n  ok: 2\nb:\n  "a:b": 3\n  ok: 4'
+        assert encoder.encode(data) == first
+
+    def test_cache_bounded(self) -> None:
+        """Test the cache never exceeds its configured size."""
+        encoder = ToonEncoder(ToonConfig(shape_cache_size=2))
+        encoder.encode({f"k{i}": {f"f{i}": i} for i in range(10)})
+        assert encoder.shape_cache_info().currsize == 2
+
+    def test_invalid_cache_size(self) -> None:
+        """Test negative cache sizes are rejected."""
+        with pytest.raises(ValueError, match="shape_cache_size"):
+            ToonEncoder(ToonConfig(shape_cache_size=-1))
+
+
+class TestIterativeEngine:
+    """Test the explicit-stack encoder engine."""
+
+    def test_matches_recursive_engine(self) -> None:
+        """Test both engines produce identical output."""
+        data = {
+            "users": [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}],
+            "mixed": [1, {"a": {"b": [1, 2]}, "c": 3}, [4, [5]], "text", {}],
+            "nested": {"deep": {"er": {"list": [[1, 2], []]}}},
+            "empty": {},
+        }
+        for key_folding in (None, "safe"):
+            recursive = ToonEncoder(ToonConfig(key_folding=key_folding))
+            iterative = ToonEncoder(ToonConfig(key_folding=key_folding, engine="iterative"))
+            assert iterative.encode(data) == recursive.encode(data)
+            assert iterative.encode(data["mixed"]) == recursive.encode(data["mixed"])
+
+    def test_beyond_recursion_limit(self) -> None:
+        """Test nesting deeper than the interpreter recursion limit."""
+        data: dict[str, object] = {}
+        node = data
+        for _ in range(10_001):
+            child: dict[str, object] = {}
+            node["k"] = child
+            node = child
+        node["x"] = 1
+        config = ToonConfig(engine="iterative", indent_size=1)
+        lines = ToonEncoder(config).encode(data).split("\n")
+        assert len(lines) == 10_002
+        assert lines[-1] == " " * 10_001 + "x: 1"
+
+    def test_beyond_recursion_limit_with_subtree_cache(self) -> None:
+        """Test subtrees too deep to key by structure are encoded without the cache."""
+        data: dict[str, object] = {}
+        node = data
+        for _ in range(10_001):
+            child: dict[str, object] = {}
+            node["k"] = child
+            node = child
+        node["x"] = 1
+        plain = ToonEncoder(ToonConfig(engine="iterative"))
+        cached = ToonEncoder(ToonConfig(engine="iterative", subtree_cache="structure"))
+        assert cached.encode(data) == plain.encode(data)
+        assert cached.subtree_cache_info().entries == 0
+
+    def test_invalid_engine(self) -> None:
+        """Test unknown engines are rejected."""
+        with pytest.raises(ValueError, match="engine"):
+            ToonEncoder(ToonConfig(engine="threaded"))
+
+
+class TestColumnarEncoding:
+    """Test encoding column-oriented tables."""
+
+    def test_matches_row_encoding(self) -> None:
+        """Test columns encode exactly like the equivalent list of rows."""
+        columns = {
+            "id": [1, 2, 3],
+            "name": ["Alice", "Bob, Jr.", "true"],
+            "score": [1.5, 2.0, None],
+        }
+        rows = [
+            dict(zip(columns, values, strict=True))
+            for values in zip(*columns.values(), strict=True)
+        ]
+        encoder = ToonEncoder()
+        assert encoder.encode_table(columns, key="users") == encoder.encode({"users": rows})
+        assert encoder.encode_table(columns) == encoder.encode(rows)
+
+    def test_array_columns(self) -> None:
+        """Test array.array columns."""
+        columns = {"x": array("i", [1, 2]), "y": array("d", [0.5, 3.0])}
+        result = ToonEncoder().encode_table(columns, key="points")
+        assert result == "points[2]{x,y}:\n  1,0.5\n  2,3"
+
+    def test_nested_in_document(self) -> None:
+        """Test a table placed inside a document."""
+        data = {"meta": {"count": 2}, "rows": TabularColumns({"a": [1, 2], "b": ["x", "y"]})}
+        config = ToonConfig(delimiter="|")
+        assert json_to_toon(data, config) == "meta:\n  count: 2\nrows[2|]{a|b}:\n  1|x\n  2|y"
+
+    def test_empty_table(self) -> None:
+        """Test a table without rows encodes like an empty array."""
+        assert ToonEncoder().encode_table({"a": []}, key="rows") == "rows[0]:"
+
+    def test_length_mismatch(self) -> None:
+        """Test columns of different lengths are rejected."""
+        with pytest.raises(ValueError, match="same length"):
+            TabularColumns({"a": [1, 2], "b": [1]})
+
+    def test_non_primitive_column(self) -> None:
+        """Test columns holding nested values are rejected."""
+        with pytest.raises(ValueError, match="non-primitive"):
+            ToonEncoder().encode_table({"a": [{"x": 1}]})
+
+    def test_numpy_columns(self) -> None:
+        """Test NumPy array columns."""
+        np = pytest.importorskip("numpy")
+        columns = {"i": np.arange(3), "f": np.array([0.25, 1.0, 2.5])}
+        result = ToonEncoder().encode_table(columns)
+        assert result == "[3]{i,f}:\n0,0.25\n1,1\n2,2.5"
+
+
+def _rows(n: int) -> Iterator[dict[str, Any]]:
+    """Generate uniform rows."""
+    for i in range(n):
+        yield {"id": i, "name": f"user{i}"}
+
+
+class _WriteOnlySink:
+    """Non-seekable text sink."""
+
+    def __init__(self) -> None:
+        self.parts: list[str] = []
+
+    def write(self, s: str) -> int:
+        self.parts.append(s)
+        return len(s)
+
+    def writelines(self, lines: Iterator[str]) -> None:
+        for line in lines:
+            self.write(line)
+
+
+@dataclass
+class _User:
+    id: int
+    name: str
+    tags: list[str]
+
+
+class _Point(NamedTuple):
+    x: int
+    y: float
+
+
+class _Slotted:
+    __slots__ = ("a", "b", "_private")
+
+    def __init__(self, a: int, b: str) -> None:
+        self.a = a
+        self.b = b
+        self._private = None
+
+
+class TestIterableEncoding:
+    """Test encoding iterators and generators as arrays."""
+
+    def test_generator_matches_list(self) -> None:
+        """Test a generator of rows encodes like the equivalent list."""
+        encoder = ToonEncoder()
+        expected = encoder.encode({"users": list(_rows(5)), "n": 5})
+        assert encoder.encode({"users": _rows(5), "n": 5}) == expected
+        assert encoder.encode(_rows(3)) == encoder.encode(list(_rows(3)))
+
+    def test_primitive_and_empty_iterators(self) -> None:
+        """Test primitive and empty iterators."""
+        data = {"p": (x for x in [1, "a", None]), "e": iter([])}
+        assert json_to_toon(data) == "p[3]: 1,a,null\ne[0]:"
+
+    def test_nested_items_materialized(self) -> None:
+        """Test iterators of non-tabular items fall back to regular arrays."""
+        data = {"m": iter([[1, 2], [3]])}
+        assert json_to_toon(data) == json_to_toon({"m": [[1, 2], [3]]})
+
+    @pytest.mark.parametrize(
+        "rows",
+        [
+            [{"a": 1}, {"b": 2}],
+            [{"a": 1}, {"a": [1, 2]}],
+            [{"a": i} for i in range(5)] + [3],
+        ],
+    )
+    def test_non_uniform_stream_matches_list(
+        self, rows: list[Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a stream whose later rows break the tabular shape encodes like the list."""
+        monkeypatch.setattr("json2toon.encoder._TABLE_BLOCK_ROWS", 2)
+        expected = json_to_toon({"r": rows})
+        assert json_to_toon({"r": iter(rows)}) == expected
+        sink = _WriteOnlySink()
+        ToonEncoder().dump({"r": iter(rows)}, sink)  # type: ignore[arg-type]
+        assert "".join(sink.parts) == expected
+
+    def test_non_uniform_stream_rejected_when_patching(self) -> None:
+        """Test a seekable file, whose rows are already written, rejects a non-uniform row."""
+        with pytest.raises(ValueError, match="Streamed row 1 does not match"):
+            ToonEncoder().dump({"r": iter([{"a": 1}, {"b": 2}])}, io.StringIO())
+
+    def test_dump_non_seekable_is_exact(self) -> None:
+        """Test non-seekable sinks receive the exact encoded output."""
+        sink = _WriteOnlySink()
+        ToonEncoder().dump({"users": _rows(4)}, sink)  # type: ignore[arg-type]
+        assert "".join(sink.parts) == json_to_toon({"users": list(_rows(4))})
+
+    def test_dump_seekable_backpatches_count(self) -> None:
+        """Test seekable files get the count patched into a reserved field."""
+        buf = io.StringIO()
+        ToonEncoder().dump({"users": _rows(3), "after": 1}, buf)
+        text = buf.getvalue()
+        assert text.startswith("users[000000000003]{id,name}:\n  0,user0")
+        assert text.endswith("after: 1")
+        assert toon_to_json(text) == {"users": list(_rows(3)), "after": 1}
+
+    def test_dump_append_mode_is_exact(self, tmp_path: Path) -> None:
+        """Test files opened for appending receive the exact encoded output."""
+        path = tmp_path / "out.toon"
+        path.write_text("# log\n")
+        with path.open("a") as fp:
+            ToonEncoder().dump({"users": _rows(3), "after": 1}, fp)
+        expected = json_to_toon({"users": list(_rows(3)), "after": 1})
+        assert path.read_text() == "# log\n" + expected
+
+
+class TestCompiledEncoder:
+    """Test shape-specialized encoders."""
+
+    def test_example_record(self) -> None:
+        """Test compiling from an example record."""
+        encoder = ToonEncoder()
+        record = {"id": 1, "name": "Ada", "score": 2.5, "active": True, "note": None}
+        compiled = encoder.compile(record)
+        other = {"id": 2, "name": "a:b", "score": 1.0, "active": False, "note": None}
+        assert compiled(record) == encoder.encode(record)
+        assert compiled(other) == encoder.encode(other)
+
+    def test_type_spec_nested(self) -> None:
+        """Test compiling from a field-to-type spec with nested objects."""
+        encoder = ToonEncoder(ToonConfig(indent_size=4))
+        compiled = encoder.compile({"id": int, "user": {"name": str, "tags": list}})
+        record = {"id": 7, "user": {"name": "Bob", "tags": ["x", "y"]}}
+        assert compiled(record) == "id: 7\nuser:\n    name: Bob\n    tags[2]: x,y"
+
+    def test_key_folding(self) -> None:
+        """Test folded single-key chains."""
+        encoder = ToonEncoder(ToonConfig(key_folding="safe"))
+        compiled = encoder.compile({"a": {"b": {"c": int}}})
+        assert compiled({"a": {"b": {"c": 1}}}) == "a.b.c: 1"
+        assert compiled({"a": {"b": {"c": 1, "d": 2}}}) == "a.b:\n  c: 1\n  d: 2"
+
+    def test_mismatch_falls_back(self) -> None:
+        """Test records that do not match the shape use the generic path."""
+        encoder = ToonEncoder()
+        compiled = encoder.compile({"id": int, "name": str})
+        for record in ({"id": "1", "name": "x"}, {"name": "x", "id": 1}, {"id": 1}, [1, 2]):
+            assert compiled(record) == encoder.encode(record)
+
+    def test_encode_array(self) -> None:
+        """Test batches of records encode as tabular arrays."""
+        encoder = ToonEncoder(ToonConfig(delimiter="|"))
+        compiled = encoder.compile({"id": int, "name": str})
+        records = [{"id": i, "name": f"n{i}"} for i in range(3)]
+        assert compiled.encode_array(records, key="rows") == encoder.encode({"rows": records})
+        assert compiled.encode_array(records) == encoder.encode(records)
+
+        records.append({"id": 3, "name": None})
+        assert compiled.encode_array(records) == encoder.encode(records)
+
+
+class TestTypeDispatch:
+    """Test encoding of non-builtin containers and the default hook."""
+
+    def test_tuples_and_sequences(self) -> None:
+        """Test tuples and other sequences encode like lists."""
+        data = {"t": (1, 2), "r": range(3), "rows": ({"a": 1}, {"a": 2})}
+        assert json_to_toon(data) == json_to_toon(
+            {"t": [1, 2], "r": [0, 1, 2], "rows": [{"a": 1}, {"a": 2}]}
+        )
+
+    def test_mappings(self) -> None:
+        """Test read-only mappings encode like dicts."""
+        data = MappingProxyType(
+            {"a": MappingProxyType({"b": 1}), "c": [MappingProxyType({"x": 1})]}
+        )
+        assert json_to_toon(data) == "a:\n  b: 1\nc[1]{x}:\n  1"
+        config = ToonConfig(key_folding="safe")
+        assert json_to_toon({"a": data["a"]}, config) == "a.b: 1"
+
+    def test_unsupported_types_fall_back_to_str(self) -> None:
+        """Test values of unknown types are encoded as their string form."""
+        assert json_to_toon({"s": {1}, "b": b"x"}) == "s: \"{1}\"\nb: b'x'"
+
+    def test_default_hook(self) -> None:
+        """Test the default hook converts unsupported values wherever they appear."""
+        config = ToonConfig(default=lambda v: v.isoformat())
+        day = datetime.date(2024, 1, 2)
+        data = {"d": day, "days": [day, day], "rows": [{"id": 1, "d": day}]}
+        expected = "d: 2024-01-02\ndays[2]: 2024-01-02,2024-01-02\nrows[1]{id,d}:\n  1,2024-01-02"
+        assert json_to_toon(data, config) == expected
+
+    def test_default_hook_in_streams_and_columns(self) -> None:
+        """Test streamed rows and table columns are converted like lists of rows."""
+        config = ToonConfig(default=lambda v: v.isoformat())
+        days = [datetime.date(2024, 1, i) for i in (1, 2)]
+        rows = [{"id": i, "d": day} for i, day in enumerate(days)]
+        expected = json_to_toon({"rows": rows}, config)
+        assert expected == "rows[2]{id,d}:\n  0,2024-01-01\n  1,2024-01-02"
+        assert json_to_toon({"rows": iter(rows)}, config) == expected
+        buf = io.StringIO()
+        ToonEncoder(config).dump({"rows": iter(rows)}, buf)
+        assert toon_to_json(buf.getvalue()) == toon_to_json(expected)
+        table = TabularColumns({"id": [0, 1], "d": days})
+        assert json_to_toon({"rows": table}, config) == expected
+
+    def test_default_hook_returning_containers(self) -> None:
+        """Test default results are encoded like any other value."""
+        config = ToonConfig(default=lambda v: sorted(v))
+        expected = json_to_toon({"s": [1, 2], "rows": [[2], [3]]})
+        assert json_to_toon({"s": {2, 1}, "rows": [{2}, {3}]}, config) == expected
+
+    def test_invalid_default(self) -> None:
+        """Test a non-callable default is rejected."""
+        with pytest.raises(ValueError, match="Invalid default"):
+            ToonEncoder(ToonConfig(default="str"))  # type: ignore[arg-type]
+
+
+class TestRecordEncoding:
+    """Test encoding dataclasses, named tuples and __slots__ objects."""
+
+    def test_records_match_dicts(self) -> None:
+        """Test records encode like dicts of their fields."""
+        data = {"u": _User(1, "Ann", ["x"]), "p": _Point(1, 2.5), "s": _Slotted(3, "c")}
+        expected = {
+            "u": {"id": 1, "name": "Ann", "tags": ["x"]},
+            "p": {"x": 1, "y": 2.5},
+            "s": {"a": 3, "b": "c"},
+        }
+        assert json_to_toon(data) == json_to_toon(expected)
+
+    def test_lists_of_records_are_tabular(self) -> None:
+        """Test lists of one record class are encoded as tabular arrays."""
+        points = [_Point(1, 2.0), _Point(3, 4.5)]
+        assert json_to_toon({"points": points}) == "points[2]{x,y}:\n  1,2\n  3,4.5"
+        rows = [_Slotted(1, "a"), _Slotted(2, "b")]
+        assert json_to_toon(rows) == "[2]{a,b}:\n1,a\n2,b"
+
+    def test_mixed_record_classes(self) -> None:
+        """Test lists mixing record classes fall back to list items."""
+        data = [_Point(1, 2.0), _Slotted(1, "a")]
+        assert json_to_toon(data) == json_to_toon([{"x": 1, "y": 2.0}, {"a": 1, "b": "a"}])
+
+    def test_key_folding_through_records(self) -> None:
+        """Test single-field records take part in key folding."""
+        config = ToonConfig(key_folding="safe")
+        assert json_to_toon({"a": {"b": _Point(1, 2.0)}}, config) == "a.b:\n  x: 1\n  y: 2"
+
+    def test_private_slots_are_not_records(self) -> None:
+        """Test classes with only private slots keep their string form."""
+        assert json_to_toon({"f": Fraction(3, 4)}) == "f: 3/4"
+
+    def test_stdlib_slots_are_not_records(self) -> None:
+        """Test standard library classes with public slots keep their string form."""
+        assert json_to_toon({"id": UUID(int=5)}) == "id: 00000000-0000-0000-0000-000000000005"
+        config = ToonConfig(default=lambda value: f"uuid-{value.int}")
+        assert json_to_toon({"id": UUID(int=5)}, config) == "id: uuid-5"
+
+
+class TestParallelEncoding:
+    """Test encoding large arrays in worker processes."""
+
+    @pytest.fixture(autouse=True)
+    def _small_chunks(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Parallelize arrays of a few items."""
+        monkeypatch.setattr("json2toon.encoder._PARALLEL_MIN_CELLS", 12)
+        monkeypatch.setattr("json2toon.encoder._PARALLEL_MIN_ITEMS", 4)
+        monkeypatch.setattr("json2toon.encoder._PARALLEL_MIN_CHUNK", 3)
+
+    def test_matches_serial(self) -> None:
+        """Test tabular, nested, mixed and record arrays match serial output."""
+        data = {
+            "rows": [{"id": i, "name": f"n{i}", "score": i / 3} for i in range(10)],
+            "nested": [[i, [i]] for i in range(7)],
+            "mixed": [{"a": i, "b": {"c": [i]}} if i % 2 else i for i in range(9)],
+            "users": [_User(i, "u", ["t"]) for i in range(5)],
+            "small": [{"x": 1}],
+        }
+        for config in (ToonConfig(), ToonConfig(delimiter="|", key_folding="safe")):
+            encoder = ToonEncoder(config)
+            assert encoder.encode(data, workers=2) == encoder.encode(data)
+
+    def test_root_array_and_dump(self) -> None:
+        """Test root arrays and file output match serial output."""
+        rows = [{"id": i, "tags": ["a", "b"]} for i in range(8)]
+        buf = io.StringIO()
+        json_to_toon_stream(rows, buf, workers=2)
+        assert buf.getvalue() == json_to_toon(rows) == json_to_toon(rows, workers=2)
+
+    def test_invalid_workers(self) -> None:
+        """Test a worker count below one is rejected."""
+        with pytest.raises(ValueError, match="Invalid workers"):
+            ToonEncoder().encode([1], workers=0)
+
+
+class TestSubtreeCache:
+    """Test reusing encoded subtrees across calls."""
+
+    def test_unchanged_subtrees_are_reused(self) -> None:
+        """Test unchanged subtrees hit the cache and output is unchanged."""
+        encoder = ToonEncoder(ToonConfig(subtree_cache="structure"))
+        catalog = {"items": [{"id": i, "name": f"item {i}"} for i in range(3)]}
+        for turn in range(3):
+            data = {"catalog": catalog, "user": {"turn": turn}}
+            assert encoder.encode(data) == json_to_toon(data)
+        info = encoder.subtree_cache_info()
+        assert info.hits == 2
+        assert info.size > 0
+
+    def test_reindented_on_reuse(self) -> None:
+        """Test a cached subtree is re-indented at another depth."""
+        encoder = ToonEncoder(ToonConfig(subtree_cache="structure"))
+        sub = {"a": [1, 2], "b": {"c": "x"}}
+        encoder.encode({"sub": sub})
+        data = {"outer": {"sub": sub}}
+        assert encoder.encode(data) == json_to_toon(data)
+        assert encoder.subtree_cache_info().hits == 1
+
+    def test_unindented_lines_not_cached_at_root(self) -> None:
+        """Test a subtree first met at the root with a line under an empty key is not reused."""
+        encoder = ToonEncoder(ToonConfig(subtree_cache="structure"))
+        sub = [{"b": {"x": 1}, "": "Alice"}]
+        assert encoder.encode({"s": sub}) == json_to_toon({"s": sub})
+        data = {"o": {"s": sub}}
+        assert encoder.encode(data) == json_to_toon(data)
+
+    def test_structure_distinguishes_types(self) -> None:
+        """Test equal values of different types are cached separately."""
+        encoder = ToonEncoder(ToonConfig(subtree_cache="structure"))
+        assert encoder.encode({"a": {"x": 1}}) == "a:\n  x: 1"
+        assert encoder.encode({"a": {"x": 1.5}}) == "a:\n  x: 1.5"
+        assert encoder.encode({"a": {"x": True}}) == "a:\n  x: true"
+
+    def test_identity_cache(self) -> None:
+        """Test identity keys reuse the same object until the cache is cleared."""
+        encoder = ToonEncoder(ToonConfig(subtree_cache="identity"))
+        sub = {"x": 1}
+        encoder.encode({"a": sub})
+        assert encoder.encode({"a": sub}) == "a:\n  x: 1"
+        assert encoder.encode({"a": {"x": 2}}) == "a:\n  x: 2"
+        sub["x"] = 3
+        encoder.clear_subtree_cache()
+        assert encoder.encode({"a": sub}) == "a:\n  x: 3"
+        assert encoder.subtree_cache_info().hits == 1
+
+    def test_iterators_are_not_cached(self) -> None:
+        """Test one-shot iterators are encoded but never cached."""
+        encoder = ToonEncoder(ToonConfig(subtree_cache="structure"))
+        buf = io.StringIO()
+        encoder.dump({"rows": {"r": _rows(2)}}, buf)
+        assert toon_to_json(buf.getvalue()) == {"rows": {"r": list(_rows(2))}}
+        assert encoder.subtree_cache_info().entries == 0
+
+    def test_invalid_mode(self) -> None:
+        """Test unknown cache modes are rejected."""
+        with pytest.raises(ValueError, match="Invalid subtree_cache"):
+            ToonEncoder(ToonConfig(subtree_cache="weak"))
+
+
+class TestBytesEncoding:
+    """Test encoding straight to UTF-8 bytes."""
+
+    DATA: dict[str, Any] = {"name": "Zoë 🎉", "rows": [{"id": i, "v": "é" * i} for i in range(50)]}
+
+    def test_encode_bytes(self) -> None:
+        """Test the bytes match the encoded string."""
+        encoder = ToonEncoder()
+        assert encoder.encode_bytes(self.DATA) == encoder.encode(self.DATA).encode()
+        assert encoder.encode_bytes({}) == b""
+
+    def test_chunk_boundaries(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test output split over many chunks is joined exactly."""
+        monkeypatch.setattr("json2toon.encoder._BYTES_CHUNK_CHARS", 7)
+        encoder = ToonEncoder()
+        assert encoder.encode_bytes(self.DATA) == encoder.encode(self.DATA).encode()
+
+    def test_encode_into_reused_buffer(self) -> None:
+        """Test documents are appended to a buffer that can be reused."""
+        encoder = ToonEncoder()
+        buf = bytearray(b"HTTP/1.1 200 OK\r\n\r\n")
+        n = encoder.encode_into(self.DATA, buf)
+        assert bytes(memoryview(buf)[-n:]) == encoder.encode(self.DATA).encode()
+
+        buf.clear()
+        assert encoder.encode_into({"a": 1}, buf) == 4
+        assert buf == b"a: 1"
@@ -0,0 +1,147 @@
+"""Tests for scalar quoting, escaping and number formatting helpers."""
+
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from json2toon.scalars import (
+    StringQuoter,
+    escape_string,
+    format_number,
+    format_numbers,
+    unescape_string,
+)
+
+
+class TestStringQuoter:
+    """Test quoting decisions."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "",
+            " pad",
+            "pad ",
+            "\u00a0nbsp",
+            "true",
+            "null",
+            "123",
+            "-1.5e3",
+            "0012",
+            "a:b",
+            "[x]",
+            "-",
+        ],
+    )
+    def test_needs_quoting(self, value: str) -> None:
+        """Test strings that must be quoted."""
+        assert StringQuoter(",").needs_quoting(value)
+
+    @pytest.mark.parametrize("value", ["Alice", "hello world", "a-b", "-x", "José", "1.2.3"])
+    def test_safe_unquoted(self, value: str) -> None:
+        """Test strings that stay unquoted."""
+        assert StringQuoter(",").quote(value) == value
+
+    def test_delimiter_specific(self) -> None:
+        """Test only the active delimiter forces quoting."""
+        assert StringQuoter(",").quote("a|b") == "a|b"
+        assert StringQuoter("|").quote("a|b") == '"a|b"'
+        assert StringQuoter("|").quote("a,b") == "a,b"
+        assert StringQuoter("\t").quote("a\tb") == '"a\\tb"'
+
+    def test_quote_escapes(self) -> None:
+        """Test quoted strings are escaped."""
+        assert StringQuoter(",").quote('say "hi"\n') == '"say \\"hi\\"\\n"'
+
+    def test_decision_cache(self) -> None:
+        """Test repeated short strings hit the cache."""
+        quoter = StringQuoter(",", cache_size=8)
+        for _ in range(3):
+            quoter.quote("active")
+        info = quoter.cache_info()
+        assert info.hits == 2
+        assert info.misses == 1
+
+    def test_long_strings_bypass_cache(self) -> None:
+        """Test long strings are not cached."""
+        quoter = StringQuoter(",")
+        quoter.quote("x" * 1000)
+        assert quoter.cache_info().currsize == 0
+
+
+class TestEscapeString:
+    """Test escaping."""
+
+    def test_escape_all(self) -> None:
+        """Test every escapable character in one string."""
+        assert escape_string('\\"\n\r\t') == '\\\\\\"\\n\\r\\t'
+
+    def test_escape_noop(self) -> None:
+        """Test strings without escapable characters are unchanged."""
+        assert escape_string("plain") == "plain"
+
+
+class TestUnescapeString:
+    """Test unescaping."""
+
+    def test_round_trip(self) -> None:
+        """Test unescaping undoes escaping, including escaped backslashes before letters."""
+        for text in ('\\"\n\r\t', "\\n", "a\\\\tb", "end\\"):
+            assert unescape_string(escape_string(text)) == text
+
+    def test_escaped_backslash_then_letter(self) -> None:
+        """Test an escaped backslash followed by n is not read as a newline."""
+        assert unescape_string("\\\\n") == "\\n"
+
+    def test_unknown_escapes_kept(self) -> None:
+        """Test backslashes not starting a known sequence are kept."""
+        assert unescape_string("a\\xb\\") == "a\\xb\\"
+
+    def test_no_backslash_returns_input(self) -> None:
+        """Test strings without backslashes are returned as they are."""
+        text = "plain text"
+        assert unescape_string(text) is text
+
+
+class TestFormatNumber:
+    """Test canonical number formatting."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            (5.0, "5"),
+            (-0.0, "0"),
+            (1e-9, "0.000000001"),
+            (-1.5e-7, "-0.00000015"),
+            (1.23456789, "1.23456789"),
+            (0.1 + 0.2, "0.30000000000000004"),
+            (1e16, "10000000000000000"),
+            (1e23, "100000000000000000000000"),
+            (2**70, "1180591620717411303424"),
+            (float("nan"), "null"),
+            (float("-inf"), "null"),
+            (True, "true"),
+        ],
+    )
+    def test_canonical_form(self, value: float, expected: str) -> None:
+        """Test values are written without exponent or lost digits."""
+        assert format_number(value) == expected
+
+    @pytest.mark.parametrize("value", [1e-9, 1.23456789, 2.5e-300, 1.7976931348623157e308, 1 / 3])
+    def test_round_trip(self, value: float) -> None:
+        """Test the formatted text parses back to the same float."""
+        assert float(format_number(value)) == value
+
+    def test_columns(self) -> None:
+        """Test batch formatting of lists, arrays and mixed columns."""
+        assert format_numbers([1, 2, 3]) == ["1", "2", "3"]
+        assert format_numbers(array("d", [1.0, 1e-9, float("inf")])) == ["1", "0.000000001", "null"]
+        assert format_numbers(x for x in [1, 2.5]) == ["1", "2.5"]
+
+    def test_numpy_columns(self) -> None:
+        """Test NumPy arrays are formatted like the equivalent lists."""
+        np = pytest.importorskip("numpy")
+        values = [0.1, 1e-9, 12345.678, 3.0]
+        assert format_numbers(np.array(values)) == format_numbers(values)